@@ -4,7 +4,7 @@ use colored::Colorize;
 use serde::{Deserialize, Serialize};
 use std::fs;
 use std::path::{Path, PathBuf};
-use std::process::Command;
+use std::process::{Child, Command, Output, Stdio};
 use std::io::{Write};
 
 use crate::core::rmm_core::RmakeConfig;
@@ -51,11 +51,17 @@ struct ShellcheckReport {
 
 /// 构建模块项目
 pub fn build_project(project_path: &Path) -> Result<()> {
-    build_project_with_options(project_path, true) // 默认启用自动修复
+    build_project_with_options(project_path, true, None) // 默认启用自动修复，默认压缩等级
 }
 
 /// 构建模块项目（带选项）
-pub fn build_project_with_options(project_path: &Path, auto_fix: bool) -> Result<()> {
+///
+/// `compression_level` 为模块 ZIP 与源码 tar.gz 共用的压缩等级（0-9），省略时使用默认等级
+pub fn build_project_with_options(
+    project_path: &Path,
+    auto_fix: bool,
+    compression_level: Option<u32>,
+) -> Result<()> {
     println!("{}", "🔨 开始构建模块项目".green().bold());
     
     // 检查项目是否有效
@@ -67,14 +73,16 @@ pub fn build_project_with_options(project_path: &Path, auto_fix: bool) -> Result
     let rmake_config = load_rmake_config(project_path)?;
     println!("{} 解析构建配置", "[+]".green().bold());
     
+    let level = compression_level.unwrap_or(DEFAULT_COMPRESSION_LEVEL);
+    
     // 创建构建目录
     setup_build_directories(project_path)?;
     
     // 执行构建流程
-    execute_build_process(project_path, &rmake_config, auto_fix)?;
+    execute_build_process(project_path, &rmake_config, auto_fix, level)?;
     
     // 执行源代码打包流程
-    execute_source_packaging(project_path, &rmake_config)?;
+    execute_source_packaging(project_path, &rmake_config, level)?;
     
     println!("\n{}", "🎉 模块构建完成！".green().bold());
     
@@ -83,9 +91,9 @@ pub fn build_project_with_options(project_path: &Path, auto_fix: bool) -> Result
 
 /// 检查是否是有效的项目
 fn is_valid_project(project_path: &Path) -> bool {
-    project_path.join("module.prop").exists() 
-        && project_path.join(".rmmp").exists()
-        && project_path.join(".rmmp/Rmake.toml").exists()
+    // Rmake.toml 存在即隐含 .rmmp 目录存在，无需单独检查
+    project_path.join("module.prop").exists()
+        && project_path.join(".rmmp/Rmake.toml").is_file()
 }
 
 /// 加载 Rmake.toml 配置
@@ -102,25 +110,34 @@ fn setup_build_directories(project_path: &Path) -> Result<()> {
     let dist_dir = project_path.join(".rmmp/dist");
     
     // 清理并重新创建构建目录
-    if build_dir.exists() {
-        fs::remove_dir_all(&build_dir)?;
-    }
-    fs::create_dir_all(&build_dir)?;
+    recreate_dir(&build_dir)?;
     
-    // 创建分发目录
-    if !dist_dir.exists() {
-        fs::create_dir_all(&dist_dir)?;
-    }
+    // 创建分发目录（create_dir_all 对已存在目录是幂等的）
+    fs::create_dir_all(&dist_dir)?;
     
     println!("{} 准备构建目录", "[+]".green().bold());
     Ok(())
 }
 
+/// 清空并重新创建目录
+///
+/// 直接删除并忽略 NotFound，省去先行的 exists() 检查
+fn recreate_dir(dir: &Path) -> Result<()> {
+    match fs::remove_dir_all(dir) {
+        Ok(()) => {}
+        Err(e) if e.kind() == std::io::ErrorKind::NotFound => {}
+        Err(e) => return Err(e.into()),
+    }
+    fs::create_dir_all(dir)?;
+    Ok(())
+}
+
 /// 执行构建流程
 fn execute_build_process(
     project_path: &Path,
     rmake_config: &RmakeConfig,
     auto_fix: bool,
+    level: u32,
 ) -> Result<()> {
     // 1. 复制文件到构建目录
     copy_files_to_build(project_path, rmake_config)?;
@@ -135,7 +152,7 @@ fn execute_build_process(
     execute_prebuild(project_path, rmake_config)?;
     
     // 5. 打包模块
-    package_module(project_path, rmake_config)?;
+    package_module(project_path, rmake_config, level)?;
     
     // 6. 执行 postbuild
     execute_postbuild(project_path, rmake_config)?;
@@ -201,35 +218,14 @@ fn get_build_entries(
         }
     }
     
+    let exclude_rules = compile_exclude_rules(exclude_patterns);
     base_entries.retain(|path| {
         let file_name = path.file_name().unwrap().to_string_lossy();
         let path_str = path.to_string_lossy();
         
-        for pattern in exclude_patterns {
-            // 简单模式匹配
-            if pattern.contains('*') {
-                // 通配符匹配
-                if pattern.ends_with("*") {
-                    let prefix = &pattern[..pattern.len() - 1];
-                    if file_name.starts_with(prefix) || path_str.contains(prefix) {
-                        println!("      {} 排除文件: {} (匹配 {})", "[x]".red(), file_name, pattern);
-                        return false;
-                    }
-                }
-                if pattern.starts_with("*") {
-                    let suffix = &pattern[1..];
-                    if file_name.ends_with(suffix) || path_str.contains(suffix) {
-                        println!("      {} 排除文件: {} (匹配 {})", "[x]".red(), file_name, pattern);
-                        return false;
-                    }
-                }
-            } else {
-                // 精确匹配
-                if file_name == pattern.as_str() || path_str.contains(pattern) {
-                    println!("      {} 排除文件: {} (匹配 {})", "[x]".red(), file_name, pattern);
-                    return false;
-                }
-            }
+        if let Some(pattern) = match_exclude_rules(&exclude_rules, &file_name, &path_str) {
+            println!("      {} 排除文件: {} (匹配 {})", "[x]".red(), file_name, pattern);
+            return false;
         }
         true
     });
@@ -256,6 +252,51 @@ fn get_build_entries(
     Ok(entries)
 }
 
+/// 预解析的排除规则，避免对每个目录项重复分析模式字符串
+enum ExcludeRule<'a> {
+    /// `prefix*`：文件名以前缀开头
+    Prefix(&'a str),
+    /// `*suffix`：文件名以后缀结尾
+    Suffix(&'a str),
+    /// 无通配符：文件名完全相同
+    Exact(&'a str),
+}
+
+/// 将排除模式一次性解析为规则列表，每条规则附带原始模式用于输出
+fn compile_exclude_rules(patterns: &[String]) -> Vec<(ExcludeRule<'_>, &str)> {
+    let mut rules = Vec::with_capacity(patterns.len());
+    for pattern in patterns {
+        let pattern = pattern.as_str();
+        if pattern.contains('*') {
+            if let Some(prefix) = pattern.strip_suffix('*') {
+                rules.push((ExcludeRule::Prefix(prefix), pattern));
+            }
+            if let Some(suffix) = pattern.strip_prefix('*') {
+                rules.push((ExcludeRule::Suffix(suffix), pattern));
+            }
+        } else {
+            rules.push((ExcludeRule::Exact(pattern), pattern));
+        }
+    }
+    rules
+}
+
+/// 返回第一条命中的排除模式；路径中包含规则片段时同样视为命中
+fn match_exclude_rules<'a>(
+    rules: &[(ExcludeRule<'_>, &'a str)],
+    file_name: &str,
+    path_str: &str,
+) -> Option<&'a str> {
+    rules.iter().find_map(|(rule, pattern)| {
+        let matched = match rule {
+            ExcludeRule::Prefix(prefix) => file_name.starts_with(prefix) || path_str.contains(prefix),
+            ExcludeRule::Suffix(suffix) => file_name.ends_with(suffix) || path_str.contains(suffix),
+            ExcludeRule::Exact(name) => file_name == *name || path_str.contains(name),
+        };
+        matched.then_some(*pattern)
+    })
+}
+
 /// 递归复制目录
 fn copy_directory(src: &Path, dest: &Path) -> Result<()> {
     // 🔧 修复：添加源目录有效性检查
@@ -272,16 +313,10 @@ fn copy_directory(src: &Path, dest: &Path) -> Result<()> {
     for entry in fs::read_dir(src)? {
         let entry = entry?;
         let src_path = entry.path();
-        
-        // 🔧 修复：添加路径有效性检查
-        if !src_path.exists() {
-            println!("⚠️ 警告: 源路径不存在，跳过: {}", src_path.display());
-            continue;
-        }
-        
         let dest_path = dest.join(entry.file_name());
         
-        if src_path.is_dir() {
+        // 目录项在 read_dir 与复制之间消失时，下面的复制会报告并跳过
+        if entry_is_dir(&entry) {
             if let Err(e) = copy_directory(&src_path, &dest_path) {
                 println!("⚠️ 警告: 复制子目录失败 {}: {}", src_path.display(), e);
             }
@@ -321,10 +356,13 @@ fn check_shell_scripts(project_path: &Path, auto_fix: bool) -> Result<()> {
     
     println!("{} 检查 shell 脚本", "[+]".green().bold());
     
-    // 检查是否安装了 shellcheck
+    // 检查是否安装了 shellcheck：只关心能否启动，不捕获版本输出
     let shellcheck_available = Command::new("shellcheck")
         .arg("--version")
-        .output()
+        .stdin(Stdio::null())
+        .stdout(Stdio::null())
+        .stderr(Stdio::null())
+        .status()
         .is_ok();
     
     if !shellcheck_available {
@@ -350,24 +388,12 @@ fn check_shell_scripts(project_path: &Path, auto_fix: bool) -> Result<()> {
         println!("    检查: {}", sh_file.display());
         report.checked_files.push(sh_file.to_string_lossy().to_string());
         
-        // 使用 JSON 格式输出获取详细信息
-        let json_output = Command::new("shellcheck")
-            .arg("--format=json")
-            .arg(&sh_file)
-            .output()?;
-        
-        // 获取带 wiki 链接的详细输出
-        let wiki_output = Command::new("shellcheck")
-            .arg("-W")
-            .arg("10") // 显示最多10个wiki链接
-            .arg(&sh_file)
-            .output()?;
-        
-        // 获取 diff 格式的修复建议
-        let diff_output = Command::new("shellcheck")
-            .arg("--format=diff")
-            .arg(&sh_file)
-            .output()?;
+        // 三种输出格式互不依赖，同时运行：
+        // JSON 格式的详细信息、带 wiki 链接的详细输出（最多10个链接）、diff 格式的修复建议
+        let [json_output, wiki_output, diff_output] = run_shellcheck_concurrently(
+            [&["--format=json"], &["-W", "10"], &["--format=diff"]],
+            sh_file,
+        )?;
         
         // 解析 JSON 输出
         if !json_output.stdout.is_empty() {
@@ -497,13 +523,24 @@ fn find_shell_scripts(dir: &Path) -> Result<Vec<PathBuf>> {
     Ok(sh_files)
 }
 
+/// 判断目录项是否为目录
+///
+/// 类型信息直接来自 read_dir 的结果，只有符号链接才需要额外 stat 其目标
+fn entry_is_dir(entry: &fs::DirEntry) -> bool {
+    match entry.file_type() {
+        Ok(file_type) if file_type.is_symlink() => entry.path().is_dir(),
+        Ok(file_type) => file_type.is_dir(),
+        Err(_) => entry.path().is_dir(),
+    }
+}
+
 /// 递归查找 shell 脚本
 fn find_shell_scripts_recursive(dir: &Path, sh_files: &mut Vec<PathBuf>) -> Result<()> {
     for entry in fs::read_dir(dir)? {
         let entry = entry?;
         let path = entry.path();
         
-        if path.is_dir() {
+        if entry_is_dir(&entry) {
             find_shell_scripts_recursive(&path, sh_files)?;
         } else if let Some(extension) = path.extension() {
             if extension == "sh" {
@@ -579,6 +616,7 @@ fn execute_prebuild(
 fn package_module(
     project_path: &Path,
     _rmake_config: &RmakeConfig,
+    level: u32,
 ) -> Result<()> {
     let build_dir = project_path.join(".rmmp/build");
     let dist_dir = project_path.join(".rmmp/dist");
@@ -591,7 +629,7 @@ fn package_module(
     println!("{} 打包模块: {}", "[zip]".magenta().bold(), module_name.cyan());
     
     // 创建 ZIP 文件
-    create_zip_archive(&build_dir, &output_path)?;
+    create_zip_archive(&build_dir, &output_path, level)?;
     
     println!("{} 模块打包完成: {}", "✅".green().bold(), output_path.display());
     
@@ -625,41 +663,77 @@ struct ProjectInfo {
     version_code: String,
 }
 
+/// 压缩包输出缓冲区大小，减少小块写入带来的系统调用
+const ARCHIVE_BUFFER_SIZE: usize = 1024 * 1024;
+
+/// 默认压缩等级，与 zlib 默认值一致；可通过 `rmm build --level` 覆盖
+pub const DEFAULT_COMPRESSION_LEVEL: u32 = 6;
+
 /// 创建 ZIP 压缩包
-fn create_zip_archive(source_dir: &Path, output_path: &Path) -> Result<()> {
+fn create_zip_archive(source_dir: &Path, output_path: &Path, level: u32) -> Result<()> {
     let file = fs::File::create(output_path)?;
-    let mut zip = zip::ZipWriter::new(file);
+    let mut zip = zip::ZipWriter::new(std::io::BufWriter::with_capacity(ARCHIVE_BUFFER_SIZE, file));
     
-    add_directory_to_zip(&mut zip, source_dir, source_dir)?;
+    add_directory_to_zip(&mut zip, source_dir, "", level)?;
     
-    zip.finish()?;
+    let mut writer = zip.finish()?;
+    writer.flush()?;
     Ok(())
 }
 
+/// 已压缩格式的扩展名，写入 ZIP 时直接存储，不再重复 DEFLATE
+const ALREADY_COMPRESSED_EXTENSIONS: &[&str] = &[
+    "png", "jpg", "jpeg", "webp", "gif", "zip", "gz", "tgz", "xz", "bz2", "zst", "7z", "apk", "jar",
+];
+
+/// 根据文件扩展名与压缩等级选择 ZIP 压缩方式
+///
+/// 等级 0 表示仅存储：zip 的 Deflated 只接受 1-9，因此直接改用 Stored
+fn zip_options_for(path: &Path, level: u32) -> zip::write::SimpleFileOptions {
+    let already_compressed = path
+        .extension()
+        .and_then(|ext| ext.to_str())
+        .map_or(false, |ext| {
+            ALREADY_COMPRESSED_EXTENSIONS.iter().any(|known| ext.eq_ignore_ascii_case(known))
+        });
+    if level == 0 || already_compressed {
+        zip::write::SimpleFileOptions::default().compression_method(zip::CompressionMethod::Stored)
+    } else {
+        zip::write::SimpleFileOptions::default()
+            .compression_method(zip::CompressionMethod::Deflated)
+            .compression_level(Some(level as i64))
+    }
+}
+
 /// 添加目录到 ZIP
+///
+/// `prefix` 为当前目录在压缩包内的路径（以 `/` 结尾，根目录为空），
+/// 条目名直接由前缀与文件名拼接，无需逐个计算相对路径
 fn add_directory_to_zip<W: Write + std::io::Seek>(
     zip: &mut zip::ZipWriter<W>,
     dir: &Path,
-    base_dir: &Path,
+    prefix: &str,
+    level: u32,
 ) -> Result<()> {
     for entry in fs::read_dir(dir)? {
         let entry = entry?;
         let path = entry.path();
-        let relative_path = path.strip_prefix(base_dir)?;
-          if path.is_dir() {
-            // 添加目录 - 确保使用正斜杠分隔符
-            let dir_name = format!("{}/", relative_path.display().to_string().replace('\\', "/"));
-            zip.add_directory(dir_name, zip::write::SimpleFileOptions::default())?;
+        let entry_name = format!("{}{}", prefix, entry.file_name().to_string_lossy());
+
+        if entry_is_dir(&entry) {
+            // 添加目录 - 使用正斜杠分隔符
+            let dir_name = format!("{}/", entry_name);
+            zip.add_directory(dir_name.as_str(), zip::write::SimpleFileOptions::default())?;
             
             // 递归添加子目录
-            add_directory_to_zip(zip, &path, base_dir)?;
+            add_directory_to_zip(zip, &path, &dir_name, level)?;
         } else {
-            // 添加文件 - 确保使用正斜杠分隔符
-            let file_name = relative_path.display().to_string().replace('\\', "/");
-            zip.start_file(file_name, zip::write::SimpleFileOptions::default())?;
+            // 添加文件
+            zip.start_file(entry_name, zip_options_for(&path, level))?;
             
-            let file_content = fs::read(&path)?;
-            zip.write_all(&file_content)?;
+            // 流式写入，避免把整个文件读入内存
+            let mut file = fs::File::open(&path)?;
+            std::io::copy(&mut file, zip)?;
         }
     }
     
@@ -667,60 +741,51 @@ fn add_directory_to_zip<W: Write + std::io::Seek>(
 }
 
 /// 创建 tar.gz 压缩包
-fn create_tar_gz_archive(source_dir: &Path, output_path: &Path) -> Result<()> {
+fn create_tar_gz_archive(source_dir: &Path, output_path: &Path, level: u32) -> Result<()> {
     use flate2::Compression;
     use flate2::write::GzEncoder;
     use tar::Builder;
     
     let tar_gz_file = fs::File::create(output_path)?;
-    let enc = GzEncoder::new(tar_gz_file, Compression::default());
+    let buffered = std::io::BufWriter::with_capacity(ARCHIVE_BUFFER_SIZE, tar_gz_file);
+    let enc = GzEncoder::new(buffered, Compression::new(level));
     let mut tar = Builder::new(enc);
     
     // 递归添加目录中的所有文件
-    add_directory_to_tar(&mut tar, source_dir, source_dir)?;
+    add_directory_to_tar(&mut tar, source_dir, "")?;
     
-    tar.finish()?;
+    // 显式完成 gzip 流并刷新缓冲区，确保写入错误不会被 drop 吞掉
+    let mut writer = tar.into_inner()?.finish()?;
+    writer.flush()?;
     Ok(())
 }
 
 /// 添加目录到 tar
+///
+/// `prefix` 含义同 [`add_directory_to_zip`]
 fn add_directory_to_tar<W: Write>(
     tar: &mut tar::Builder<W>,
     dir: &Path,
-    base_dir: &Path,
+    prefix: &str,
 ) -> Result<()> {
-    // 🔧 修复：添加路径有效性检查
-    if !dir.exists() {
-        println!("⚠️ 警告: 目录不存在，跳过: {}", dir.display());
-        return Ok(());
-    }
+    // 🔧 修复：目录不存在时跳过（直接由 read_dir 的错误判断，无需额外 stat）
+    let entries = match fs::read_dir(dir) {
+        Ok(entries) => entries,
+        Err(e) if e.kind() == std::io::ErrorKind::NotFound => {
+            println!("⚠️ 警告: 目录不存在，跳过: {}", dir.display());
+            return Ok(());
+        }
+        Err(e) => return Err(e.into()),
+    };
 
-    for entry in fs::read_dir(dir)? {
+    for entry in entries {
         let entry = entry?;
         let path = entry.path();
         
-        // 🔧 修复：添加路径存在性检查
-        if !path.exists() {
-            println!("⚠️ 警告: 路径不存在，跳过: {}", path.display());
-            continue;
-        }
-        
-        let relative_path = match path.strip_prefix(base_dir) {
-            Ok(rel_path) => rel_path,
-            Err(e) => {
-                println!("⚠️ 警告: 无法计算相对路径 {}: {}", path.display(), e);
-                continue;
-            }
-        };
-        
-        // 确保路径使用正确的分隔符，并且不为空
-        let normalized_path = if relative_path.as_os_str().is_empty() {
-            continue; // 跳过根目录自身
-        } else {
-            relative_path.to_string_lossy().replace('\\', "/")
-        };
+        // 由前缀拼接条目名，分隔符始终为正斜杠
+        let normalized_path = format!("{}{}", prefix, entry.file_name().to_string_lossy());
         
-        if path.is_dir() {
+        if entry_is_dir(&entry) {
             // 添加目录条目（以 / 结尾）
             let mut header = tar::Header::new_gnu();
             header.set_mode(0o755);
@@ -728,11 +793,7 @@ fn add_directory_to_tar<W: Write>(
             header.set_size(0);
             header.set_cksum();
             
-            let dir_path = if normalized_path.is_empty() {
-                continue; // 跳过空路径
-            } else {
-                format!("{}/", normalized_path)
-            };
+            let dir_path = format!("{}/", normalized_path);
             
             // 🔧 修复：添加错误处理
             if let Err(e) = tar.append_data(&mut header, &dir_path, std::io::empty()) {
@@ -741,13 +802,8 @@ fn add_directory_to_tar<W: Write>(
             }
             
             // 递归添加子目录
-            add_directory_to_tar(tar, &path, base_dir)?;
+            add_directory_to_tar(tar, &path, &dir_path)?;
         } else {
-            // 添加文件
-            if normalized_path.is_empty() {
-                continue; // 跳过空路径
-            }
-            
             // 🔧 修复：更安全的文件打开方式
             let mut file = match fs::File::open(&path) {
                 Ok(f) => f,
@@ -757,6 +813,7 @@ fn add_directory_to_tar<W: Write>(
                 }
             };
             
+            // 基于已打开的句柄获取元数据，不再按路径重复 stat
             let metadata = match file.metadata() {
                 Ok(m) => m,
                 Err(e) => {
@@ -846,15 +903,13 @@ fn execute_postbuild(
 fn execute_source_packaging(
     project_path: &Path,
     rmake_config: &RmakeConfig,
+    level: u32,
 ) -> Result<()> {
     println!("{} 开始源代码打包", "[tar]".cyan().bold());
     
     // 创建源代码构建目录
     let source_build_dir = project_path.join(".rmmp/source-build");
-    if source_build_dir.exists() {
-        fs::remove_dir_all(&source_build_dir)?;
-    }
-    fs::create_dir_all(&source_build_dir)?;
+    recreate_dir(&source_build_dir)?;
     
     // 复制源代码文件（依据 src 配置）
     copy_source_files(project_path, &source_build_dir, rmake_config)?;
@@ -863,7 +918,7 @@ fn execute_source_packaging(
     execute_source_prebuild(project_path)?;
     
     // 打包源代码
-    package_source_code(project_path, &source_build_dir)?;
+    package_source_code(project_path, &source_build_dir, level)?;
     
     // 执行源代码 postbuild
     execute_source_postbuild(project_path)?;
@@ -895,32 +950,14 @@ fn copy_source_files(project_path: &Path, source_build_dir: &Path, rmake_config:
             }
         }
         
+        let exclude_rules = compile_exclude_rules(&src_config.exclude);
         source_entries.retain(|path| {
             let file_name = path.file_name().unwrap().to_string_lossy();
             let path_str = path.to_string_lossy();
             
-            for pattern in &src_config.exclude {
-                if pattern.contains('*') {
-                    if pattern.ends_with("*") {
-                        let prefix = &pattern[..pattern.len() - 1];
-                        if file_name.starts_with(prefix) || path_str.contains(prefix) {
-                            println!("      {} 排除源文件: {} (匹配 {})", "[x]".red(), file_name, pattern);
-                            return false;
-                        }
-                    }
-                    if pattern.starts_with("*") {
-                        let suffix = &pattern[1..];
-                        if file_name.ends_with(suffix) || path_str.contains(suffix) {
-                            println!("      {} 排除源文件: {} (匹配 {})", "[x]".red(), file_name, pattern);
-                            return false;
-                        }
-                    }
-                } else {
-                    if file_name == pattern.as_str() || path_str.contains(pattern) {
-                        println!("      {} 排除源文件: {} (匹配 {})", "[x]".red(), file_name, pattern);
-                        return false;
-                    }
-                }
+            if let Some(pattern) = match_exclude_rules(&exclude_rules, &file_name, &path_str) {
+                println!("      {} 排除源文件: {} (匹配 {})", "[x]".red(), file_name, pattern);
+                return false;
             }
             true
         });
@@ -1033,7 +1070,7 @@ fn execute_source_prebuild(project_path: &Path) -> Result<()> {
 }
 
 /// 打包源代码
-fn package_source_code(project_path: &Path, source_build_dir: &Path) -> Result<()> {
+fn package_source_code(project_path: &Path, source_build_dir: &Path, level: u32) -> Result<()> {
     // 🔧 修复：验证源目录
     if !source_build_dir.exists() {
         return Err(anyhow::anyhow!("源代码构建目录不存在: {}", source_build_dir.display()));
@@ -1060,7 +1097,7 @@ fn package_source_code(project_path: &Path, source_build_dir: &Path) -> Result<(
     println!("{} 打包源代码: {}", "[tar]".cyan().bold(), source_name.cyan());
     
     // 🔧 修复：添加详细的错误处理
-    match create_tar_gz_archive(source_build_dir, &output_path) {
+    match create_tar_gz_archive(source_build_dir, &output_path, level) {
         Ok(()) => {
             println!("{} 源代码打包完成: {}", "✅".green().bold(), output_path.display());
             Ok(())
@@ -1245,6 +1282,58 @@ fn format_issue_for_ai(issue: &ShellcheckIssue) -> String {
     content
 }
 
+/// 同时启动多组参数的 shellcheck，并按参数顺序返回各自的输出
+///
+/// 任一进程启动或等待失败时，终止并回收其余已启动的进程，避免遗留僵尸进程
+fn run_shellcheck_concurrently<const N: usize>(
+    arg_sets: [&[&str]; N],
+    sh_file: &Path,
+) -> Result<[Output; N]> {
+    let mut children = Vec::with_capacity(N);
+    for args in arg_sets {
+        match spawn_shellcheck(args, sh_file) {
+            Ok(child) => children.push(child),
+            Err(e) => {
+                reap_children(children);
+                return Err(e);
+            }
+        }
+    }
+    
+    let mut outputs = Vec::with_capacity(N);
+    let mut remaining = children.into_iter();
+    while let Some(child) = remaining.next() {
+        match child.wait_with_output() {
+            Ok(output) => outputs.push(output),
+            Err(e) => {
+                reap_children(remaining);
+                return Err(e.into());
+            }
+        }
+    }
+    
+    Ok(outputs.try_into().expect("每个子进程恰好对应一个输出"))
+}
+
+/// 终止并回收子进程
+fn reap_children(children: impl IntoIterator<Item = Child>) {
+    for mut child in children {
+        let _ = child.kill();
+        let _ = child.wait();
+    }
+}
+
+/// 以管道捕获输出的方式启动 shellcheck，不等待其结束
+fn spawn_shellcheck(args: &[&str], sh_file: &Path) -> Result<Child> {
+    Ok(Command::new("shellcheck")
+        .args(args)
+        .arg(sh_file)
+        .stdin(Stdio::null())
+        .stdout(Stdio::piped())
+        .stderr(Stdio::piped())
+        .spawn()?)
+}
+
 /// 重新检查修复后的脚本
 fn recheck_fixed_scripts(sh_files: &[PathBuf]) -> Result<ShellcheckReport> {
     let mut report = ShellcheckReport {
@@ -1462,17 +1551,19 @@ fn copy_file_with_line_ending_normalization(src: &Path, dst: &Path) -> Result<()
     if needs_line_ending_normalization(src) {
         // 需要规范化行尾序列的文件
         let content = std::fs::read_to_string(src)?;
-        let has_crlf = content.contains("\r\n") || content.contains("\r");
-        let normalized_content = normalize_line_endings(&content);
-        
-        if has_crlf {
+        // 单次扫描 '\r' 即可同时覆盖 CRLF 与单独的 CR
+        if content.contains('\r') {
+            let normalized_content = normalize_line_endings(&content);
             // 修复源文件的行尾序列
             std::fs::write(src, &normalized_content)?;
             println!("    {} 修复源文件行尾序列: {}", "[~]".bright_yellow(), src.display());
+            
+            // 写入构建目录
+            std::fs::write(dst, normalized_content)?;
+        } else {
+            // 行尾已是 LF，无需再做替换
+            std::fs::write(dst, content)?;
         }
-        
-        // 写入构建目录
-        std::fs::write(dst, normalized_content)?;
     } else {
         // 二进制文件或不需要规范化的文件
         std::fs::copy(src, dst)?;
@@ -1565,3 +1656,133 @@ fn apply_exclusions_and_collect_paths(
     
     Ok(paths_to_copy)
 }
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    /// 重构前的排除匹配逻辑，作为行为基准
+    fn legacy_exclude_match(patterns: &[String], file_name: &str, path_str: &str) -> bool {
+        for pattern in patterns {
+            if pattern.contains('*') {
+                if pattern.ends_with("*") {
+                    let prefix = &pattern[..pattern.len() - 1];
+                    if file_name.starts_with(prefix) || path_str.contains(prefix) {
+                        return true;
+                    }
+                }
+                if pattern.starts_with("*") {
+                    let suffix = &pattern[1..];
+                    if file_name.ends_with(suffix) || path_str.contains(suffix) {
+                        return true;
+                    }
+                }
+            } else if file_name == pattern.as_str() || path_str.contains(pattern.as_str()) {
+                return true;
+            }
+        }
+        false
+    }
+
+    fn patterns(list: &[&str]) -> Vec<String> {
+        list.iter().map(|p| p.to_string()).collect()
+    }
+
+    fn is_excluded(list: &[&str], file_name: &str, path_str: &str) -> Option<String> {
+        let patterns = patterns(list);
+        let rules = compile_exclude_rules(&patterns);
+        match_exclude_rules(&rules, file_name, path_str).map(str::to_string)
+    }
+
+    #[test]
+    fn test_exclude_exact_name() {
+        assert_eq!(
+            is_excluded(&["README.md"], "README.md", "/proj/README.md").as_deref(),
+            Some("README.md")
+        );
+        assert_eq!(is_excluded(&["README.md"], "README.txt", "/proj/README.txt"), None);
+        // 精确模式同样按路径子串匹配
+        assert!(is_excluded(&["secret"], "a.txt", "/proj/secret/a.txt").is_some());
+    }
+
+    #[test]
+    fn test_exclude_globs() {
+        // `*suffix`
+        assert!(is_excluded(&["*.log"], "build.log", "/proj/build.log").is_some());
+        assert!(is_excluded(&["*.log"], "build.txt", "/proj/build.txt").is_none());
+        // `prefix*`
+        assert!(is_excluded(&["test_*"], "test_a.sh", "/proj/test_a.sh").is_some());
+        assert!(is_excluded(&["test_*"], "a_test.sh", "/proj/a_test.sh").is_none());
+        // 前后都有通配符时两条规则各自保留另一端的 `*`，按字面匹配，不表示"包含"
+        assert!(is_excluded(&["*tmp*"], "tmpfile", "/proj/tmpfile").is_none());
+        assert!(is_excluded(&["*tmp*"], "file.tmp", "/proj/file.tmp").is_none());
+        // 单独的 `*` 匹配一切
+        assert!(is_excluded(&["*"], "anything", "/proj/anything").is_some());
+        // 中间的通配符不被支持，不会匹配任何文件
+        assert!(is_excluded(&["a*b"], "axb", "/proj/axb").is_none());
+    }
+
+    #[test]
+    fn test_exclude_directory_patterns() {
+        // 目录名作为精确模式
+        assert!(is_excluded(&["node_modules"], "node_modules", "/proj/node_modules").is_some());
+        assert!(is_excluded(&[".git"], ".git", "/proj/.git").is_some());
+        // 带结尾斜杠的模式只能通过路径子串命中，目录项自身的路径不带斜杠
+        assert!(is_excluded(&["docs/"], "docs", "/proj/docs").is_none());
+        assert!(is_excluded(&["docs/"], "a.md", "/proj/docs/a.md").is_some());
+    }
+
+    #[test]
+    fn test_exclude_returns_first_matching_pattern() {
+        assert_eq!(
+            is_excluded(&["*.md", "README.md"], "README.md", "/proj/README.md").as_deref(),
+            Some("*.md")
+        );
+    }
+
+    #[test]
+    fn test_exclude_matches_legacy_behaviour() {
+        let pattern_sets: &[&[&str]] = &[
+            &[],
+            &["README.md"],
+            &["*.log"],
+            &["test_*"],
+            &["*tmp*"],
+            &["*"],
+            &["a*b"],
+            &["docs/"],
+            &["node_modules", "*.bak", "build*"],
+            &[".git", ".github*", "*.zip"],
+        ];
+        let entries: &[(&str, &str)] = &[
+            ("README.md", "/proj/README.md"),
+            ("build.log", "/proj/build.log"),
+            ("test_a.sh", "/proj/test_a.sh"),
+            ("a_test.sh", "/proj/a_test.sh"),
+            ("tmpfile", "/proj/tmpfile"),
+            ("axb", "/proj/axb"),
+            ("docs", "/proj/docs"),
+            ("node_modules", "/proj/node_modules"),
+            ("old.bak", "/proj/old.bak"),
+            ("build", "/proj/build"),
+            (".github", "/proj/.github"),
+            ("module.zip", "/proj/module.zip"),
+            ("service.sh", "/home/build/proj/service.sh"),
+            ("customize.sh", "/proj/customize.sh"),
+        ];
+
+        for set in pattern_sets {
+            let patterns = patterns(set);
+            let rules = compile_exclude_rules(&patterns);
+            for (file_name, path_str) in entries {
+                assert_eq!(
+                    match_exclude_rules(&rules, file_name, path_str).is_some(),
+                    legacy_exclude_match(&patterns, file_name, path_str),
+                    "patterns {:?} on {}",
+                    set,
+                    path_str
+                );
+            }
+        }
+    }
+}
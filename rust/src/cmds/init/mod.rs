@@ -1,7 +1,7 @@
 use anyhow::Result;
 use std::collections::HashMap;
 use std::fs;
-use std::path::{Path, PathBuf};
+use std::path::Path;
 use toml;
 use colored::*;
 use chrono::{Utc, Datelike};
@@ -10,7 +10,8 @@ use git2::{Repository, Config};
 
 use crate::core::rmm_core::{
     Author, BuildConfig, BuildSystem, ModuleProp, ProjectInfo, 
-    RmakeConfig, RmmProject, SrcConfig, UrlsInfo, GitAnalyzer, GitInfo
+    RmakeConfig, RmmProject, SrcConfig, UrlsInfo, GitAnalyzer, GitInfo,
+    is_valid_project_name
 };
 
 /// 初始化新的模块项目
@@ -27,8 +28,7 @@ pub fn init_project(project_path: &Path, project_id: &str, author: &str, email:
     }// 验证项目ID格式（符合KernelSU要求）
     // ID必须与这个正则表达式匹配：^[a-zA-Z][a-zA-Z0-9._-]+$
     // 例如：✓ a_module，✓ a.module，✓ module-101，✗ a module，✗ 1_module，✗ -a-module
-    let id_regex = regex::Regex::new(r"^[a-zA-Z][a-zA-Z0-9._-]+$").unwrap();
-    if !id_regex.is_match(project_id) {
+    if !is_valid_project_name(project_id) {
         anyhow::bail!("项目ID格式无效。必须以字母开头，只能包含字母、数字、点、下划线和连字符，且至少2个字符");
     }
 
@@ -369,19 +369,23 @@ fn create_module_prop(project_path: &Path, project_id: &str, author: &str, git_i
         update_json: update_json_url,
     };
 
-    // 使用 UNIX 换行符 (LF) 构建内容
-    let mut prop_content = String::new();
-    prop_content.push_str(&format!("id={}\n", module_prop.id));
-    prop_content.push_str(&format!("name={}\n", module_prop.name));
-    prop_content.push_str(&format!("version={}\n", module_prop.version));
-    prop_content.push_str(&format!("versionCode={}\n", module_prop.version_code));
-    prop_content.push_str(&format!("author={}\n", module_prop.author));
-    prop_content.push_str(&format!("description={}\n", module_prop.description));
-    prop_content.push_str(&format!("updateJson={}\n", module_prop.update_json));
-
-    // 确保使用 UNIX 换行符写入文件
-    let prop_content_bytes = prop_content.replace("\r\n", "\n").replace("\r", "\n");
-    fs::write(&module_prop_path, prop_content_bytes)?;
+    // 使用 UNIX 换行符 (LF) 一次性构建全部内容
+    let mut prop_content = format!(
+        "id={}\nname={}\nversion={}\nversionCode={}\nauthor={}\ndescription={}\nupdateJson={}\n",
+        module_prop.id,
+        module_prop.name,
+        module_prop.version,
+        module_prop.version_code,
+        module_prop.author,
+        module_prop.description,
+        module_prop.update_json,
+    );
+
+    // 确保使用 UNIX 换行符写入文件（字段值中极少含 CR，仅在需要时替换）
+    if prop_content.contains('\r') {
+        prop_content = prop_content.replace("\r\n", "\n").replace('\r', "\n");
+    }
+    fs::write(&module_prop_path, prop_content)?;
     println!("{} 创建 {}", 
         "[+]".green().bold(), 
         "module.prop".cyan().bold()
@@ -410,19 +414,34 @@ fn create_system_structure(project_path: &Path) -> Result<()> {
         println!("{} 创建 {} 目录", "[+]".green().bold(), "system/etc".cyan().bold());
     }
 
-    if example_conf_path.exists() {
-        println!("{} 文件 {} 已存在，跳过创建。", "[!]".yellow().bold(), "system/etc/example.conf".cyan().bold());
-    } else {
-        fs::write(
-            &example_conf_path,
-            "# 这是一个示例配置文件\n# 将此文件放置在system目录中，它会被挂载到 /system/etc/example.conf\n"
-        )?;
+    let created = write_new_file(
+        &example_conf_path,
+        "# 这是一个示例配置文件\n# 将此文件放置在system目录中，它会被挂载到 /system/etc/example.conf\n"
+    )?;
+    if created {
         println!("{} 创建 {} 文件", "[+]".green().bold(), "system/etc/example.conf".cyan().bold());
+    } else {
+        println!("{} 文件 {} 已存在，跳过创建。", "[!]".yellow().bold(), "system/etc/example.conf".cyan().bold());
     }
 
     Ok(())
 }
 
+/// 仅在文件不存在时创建并写入内容，返回是否实际创建
+///
+/// 使用 create_new 一次系统调用同时完成存在性检查与创建，避免先 stat 再打开
+fn write_new_file(path: &Path, contents: &str) -> Result<bool> {
+    use std::io::Write;
+    match fs::OpenOptions::new().write(true).create_new(true).open(path) {
+        Ok(mut file) => {
+            file.write_all(contents.as_bytes())?;
+            Ok(true)
+        }
+        Err(e) if e.kind() == std::io::ErrorKind::AlreadyExists => Ok(false),
+        Err(e) => Err(e.into()),
+    }
+}
+
 /// 创建customize.sh安装脚本
 fn create_customize_script(project_path: &Path) -> Result<()> {
     let customize_script_path = project_path.join("customize.sh");
@@ -512,11 +531,6 @@ fn create_documentation_files(project_path: &Path, project_id: &str) -> Result<(
 fn create_readme(project_path: &Path, project_id: &str) -> Result<()> {
     let readme_path = project_path.join("README.md");
     
-    if readme_path.exists() {
-        println!("{} 文件 {} 已存在，跳过创建。", "[!]".yellow().bold(), "README.md".cyan().bold());
-        return Ok(());
-    }
-
     let readme_content = format!(r#"# {} Module
 
 这是一个 rmm 模块项目。
@@ -567,11 +581,14 @@ rmm test
         project_id
     );
 
-    fs::write(&readme_path, readme_content)?;
-    println!("{} 创建 {}", 
-        "[+]".green().bold(), 
-        "README.md".cyan().bold()
-    );
+    if write_new_file(&readme_path, &readme_content)? {
+        println!("{} 创建 {}", 
+            "[+]".green().bold(), 
+            "README.md".cyan().bold()
+        );
+    } else {
+        println!("{} 文件 {} 已存在，跳过创建。", "[!]".yellow().bold(), "README.md".cyan().bold());
+    }
     Ok(())
 }
 
@@ -579,11 +596,6 @@ rmm test
 fn create_changelog(project_path: &Path) -> Result<()> {
     let changelog_path = project_path.join("CHANGELOG.md");
     
-    if changelog_path.exists() {
-        println!("{} 文件 {} 已存在，跳过创建。", "[!]".yellow().bold(), "CHANGELOG.md".cyan().bold());
-        return Ok(());
-    }
-
     let changelog_content = r#"# 更新日志
 
 ### 新增
@@ -597,11 +609,14 @@ fn create_changelog(project_path: &Path) -> Result<()> {
 - 无
 "#;
 
-    fs::write(&changelog_path, changelog_content)?;
-    println!("{} 创建 {}", 
-        "[+]".green().bold(), 
-        "CHANGELOG.md".cyan().bold()
-    );
+    if write_new_file(&changelog_path, &changelog_content)? {
+        println!("{} 创建 {}", 
+            "[+]".green().bold(), 
+            "CHANGELOG.md".cyan().bold()
+        );
+    } else {
+        println!("{} 文件 {} 已存在，跳过创建。", "[!]".yellow().bold(), "CHANGELOG.md".cyan().bold());
+    }
     Ok(())
 }
 
@@ -609,11 +624,6 @@ fn create_changelog(project_path: &Path) -> Result<()> {
 fn create_license(project_path: &Path) -> Result<()> {
     let license_path = project_path.join("LICENSE");
     
-    if license_path.exists() {
-        println!("{} 文件 {} 已存在，跳过创建。", "[!]".yellow().bold(), "LICENSE".cyan().bold());
-        return Ok(());
-    }
-
     let license_content = r#"#在此处添加你的许可证
     
 # 请不要移除以下许可信息
@@ -641,11 +651,14 @@ SOFTWARE.
 
 "#;
 
-    fs::write(&license_path, license_content)?;
-    println!("{} 创建 {}", 
-        "[+]".green().bold(), 
-        "LICENSE".cyan().bold()
-    );
+    if write_new_file(&license_path, &license_content)? {
+        println!("{} 创建 {}", 
+            "[+]".green().bold(), 
+            "LICENSE".cyan().bold()
+        );
+    } else {
+        println!("{} 文件 {} 已存在，跳过创建。", "[!]".yellow().bold(), "LICENSE".cyan().bold());
+    }
     Ok(())
 }
 
@@ -662,23 +675,15 @@ fn generate_update_json_url(remote_url: &str, project_id: &str) -> String {
     }
 }
 
+/// GitHub 仓库地址正则（同时匹配 HTTPS 与 SSH 格式），首次使用时编译一次
+static GITHUB_URL_REGEX: std::sync::LazyLock<regex::Regex> = std::sync::LazyLock::new(|| {
+    regex::Regex::new(r"github\.com[:/]([^/]+)/([^/\.]+)(?:\.git)?").unwrap()
+});
+
 /// 解析GitHub URL，返回 (owner, repo)
 fn parse_github_url(url: &str) -> Option<(String, String)> {
-    let patterns = [
-        r"github\.com[:/]([^/]+)/([^/\.]+)(?:\.git)?",
-        r"github\.com/([^/]+)/([^/\.]+)",
-    ];
-    
-    for pattern in &patterns {
-        if let Ok(re) = regex::Regex::new(pattern) {
-            if let Some(caps) = re.captures(url) {
-                if caps.len() >= 3 {
-                    return Some((caps[1].to_string(), caps[2].to_string()));
-                }
-            }
-        }
-    }
-    None
+    let caps = GITHUB_URL_REGEX.captures(url)?;
+    Some((caps[1].to_string(), caps[2].to_string()))
 }
 
 /// 创建 update.json 文件
@@ -731,24 +736,13 @@ fn create_update_json(
     };    // 生成 changelog URL，需要考虑项目的相对路径
     let changelog_url = if let Some(git) = git_info {
         if let Some(remote_url) = &git.remote_url {            if let Some((owner, repo)) = parse_github_url(remote_url) {
-                // 计算项目相对于 Git 仓库根目录的路径
-                let project_relative_path = if let Ok(repo_root) = get_git_repo_root(project_path) {
-                    // 规范化项目路径
-                    let normalized_project_path = project_path.canonicalize().unwrap_or_else(|_| project_path.to_path_buf());
-                    
-                    if let Ok(relative_path) = normalized_project_path.strip_prefix(&repo_root) {
-                        if relative_path.as_os_str().is_empty() {
-                            "CHANGELOG.md".to_string()
-                        } else {
-                            // 将 Windows 路径分隔符转换为 URL 分隔符
-                            let relative_path_str = relative_path.display().to_string().replace("\\", "/");
-                            format!("{}/CHANGELOG.md", relative_path_str)
-                        }
-                    } else {
-                        "CHANGELOG.md".to_string()
-                    }
-                } else {
+                // 项目相对于 Git 仓库根目录的路径：GitInfo 已基于规范化后的项目路径计算，直接复用
+                let project_relative_path = if git.relative_path.as_os_str().is_empty() {
                     "CHANGELOG.md".to_string()
+                } else {
+                    // 将 Windows 路径分隔符转换为 URL 分隔符
+                    let relative_path_str = git.relative_path.display().to_string().replace("\\", "/");
+                    format!("{}/CHANGELOG.md", relative_path_str)
                 };
                 
                 format!("https://raw.githubusercontent.com/{}/{}/{}/{}", 
@@ -778,17 +772,3 @@ fn create_update_json(
     );
     Ok(())
 }
-
-/// 获取 Git 仓库的根目录
-fn get_git_repo_root(path: &Path) -> Result<PathBuf> {
-    let repo = git2::Repository::discover(path)
-        .map_err(|e| anyhow::anyhow!("无法找到 Git 仓库: {}", e))?;
-    
-    let workdir = repo.workdir()
-        .ok_or_else(|| anyhow::anyhow!("无法获取 Git 工作目录"))?;
-    
-    // 规范化路径，确保路径格式一致
-    Ok(workdir.canonicalize()?)
-}
-
-
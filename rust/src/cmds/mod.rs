@@ -25,6 +25,10 @@ pub enum Commands {
         #[arg(long, default_value = "false")]
         no_auto_fix: bool,
         
+        /// 压缩等级 0-9（默认 6；0 仅存储，1 最快，9 压缩率最高）
+        #[arg(long, value_parser = clap::value_parser!(u32).range(0..=9))]
+        level: Option<u32>,
+        
         /// 运行 Rmake.toml 中定义的脚本
         #[arg(value_name = "SCRIPT")]
         script: Option<String>,    },
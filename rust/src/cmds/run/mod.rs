@@ -117,19 +117,11 @@ fn execute_command(project_path: &Path, command: &str) -> Result<()> {
         cmd
     };
     
-    let output = cmd.output()?;
+    // 继承 stdout/stderr，命令输出实时显示
+    let status = cmd.status()?;
     
-    // 输出命令结果
-    if !output.stdout.is_empty() {
-        print!("{}", String::from_utf8_lossy(&output.stdout));
-    }
-    
-    if !output.stderr.is_empty() {
-        eprint!("{}", String::from_utf8_lossy(&output.stderr));
-    }
-    
-    if !output.status.success() {
-        anyhow::bail!("命令执行失败，退出码: {:?}", output.status.code());
+    if !status.success() {
+        anyhow::bail!("命令执行失败，退出码: {:?}", status.code());
     }
     
     Ok(())
@@ -137,11 +129,11 @@ fn execute_command(project_path: &Path, command: &str) -> Result<()> {
 
 /// 检查是否是有效的项目
 fn is_valid_project(project_path: &Path) -> bool {
-    let rmmp_dir = project_path.join(".rmmp");
-    let rmake_file = rmmp_dir.join("Rmake.toml");
+    // Rmake.toml 存在即隐含 .rmmp 目录存在，无需单独检查
+    let rmake_file = project_path.join(".rmmp").join("Rmake.toml");
     let module_prop = project_path.join("module.prop");
     
-    rmmp_dir.exists() && rmake_file.exists() && module_prop.exists()
+    rmake_file.is_file() && module_prop.exists()
 }
 
 #[cfg(test)]
@@ -22,9 +22,10 @@ impl AuthorInfo {
     }
     
     fn from_git(path: &Path) -> Option<Self> {
-        GitAnalyzer::analyze_git_info(path).ok().flatten().and_then(|git_info| {
+        // 只需仓库根目录，不做完整的 Git 分析（避免扫描工作区状态）
+        GitAnalyzer::find_git_root(path).ok().flatten().and_then(|repo_root| {
             // 从 git config 获取用户信息
-            if let Ok(repo) = git2::Repository::open(&git_info.repo_root) {
+            if let Ok(repo) = git2::Repository::open(&repo_root) {
                 let config = repo.config().ok()?;
                 let name = config.get_string("user.name").ok()?;
                 let email = config.get_string("user.email").ok()?;
@@ -40,11 +41,9 @@ impl AuthorInfo {
 
 /// 检查项目是否有效
 fn is_valid_project(project_path: &Path) -> bool {
-    project_path.exists() && 
-    project_path.is_dir() && 
-    project_path.join("rmmproject.toml").exists() &&
-    project_path.join(".rmmp").exists() &&
-    project_path.join(".rmmp").join("Rmake.toml").exists()
+    // 子文件存在即隐含项目目录与 .rmmp 目录存在，只需两次 stat
+    project_path.join("rmmproject.toml").is_file() &&
+    project_path.join(".rmmp").join("Rmake.toml").is_file()
 }
 
 /// 版本管理
@@ -62,12 +61,12 @@ impl VersionInfo {
         }
     }
       /// 智能版本升级 - 支持基于日期和Git的版本管理
-    fn smart_bump_version(&mut self, project_path: &Path) {
+    fn smart_bump_version(&mut self, patch_hash: &str) {
         // 使用智能版本升级
-        self.version = smart_version_bump(&self.version, project_path);
+        self.version = smart_version_bump(&self.version, patch_hash);
         
         // 生成新的版本代码
-        self.version_code = generate_version_code(project_path);
+        self.version_code = generate_version_code(&self.version_code);
     }
     
     /// 传统版本升级（保留兼容性）
@@ -95,10 +94,10 @@ impl VersionInfo {
         let mut version_code = String::new();
         
         for line in content.lines() {
-            if line.starts_with("version=") {
-                version = line.trim_start_matches("version=").to_string();
-            } else if line.starts_with("versionCode=") {
-                version_code = line.trim_start_matches("versionCode=").to_string();
+            if let Some(value) = line.strip_prefix("version=") {
+                version = value.to_string();
+            } else if let Some(value) = line.strip_prefix("versionCode=") {
+                version_code = value.to_string();
             }
         }
         
@@ -110,19 +109,25 @@ impl VersionInfo {
         let module_prop_path = project_path.join("module.prop");
         let content = fs::read_to_string(&module_prop_path)?;
         
-        let mut new_content = String::new();
+        // 在内存中一次拼好全部内容再整体写回，逐行追加不产生临时字符串
+        let mut new_content = String::with_capacity(content.len() + 32);
         for line in content.lines() {
             if line.starts_with("version=") {
-                new_content.push_str(&format!("version={}\n", self.version));
+                new_content.push_str("version=");
+                new_content.push_str(&self.version);
             } else if line.starts_with("versionCode=") {
-                new_content.push_str(&format!("versionCode={}\n", self.version_code));
+                new_content.push_str("versionCode=");
+                new_content.push_str(&self.version_code);
             } else {
                 new_content.push_str(line);
-                new_content.push('\n');
             }
+            new_content.push('\n');
         }
         
-        fs::write(module_prop_path, new_content)?;
+        // 内容未变化时不重写文件
+        if new_content != content {
+            fs::write(module_prop_path, new_content)?;
+        }
         Ok(())
     }
 }
@@ -253,7 +258,13 @@ fn sync_version_info(core: &RmmCore, project_path: &Path) -> Result<()> {
         let old_version = version_info.version.clone();
         let old_code = version_info.version_code.clone();
         
-        version_info.smart_bump_version(project_path);
+        // 版本号已带有当前 HEAD 的提交 hash，说明自上次同步以来没有新提交，无需升级
+        let patch_hash = head_short_hash(project_path);
+        let head_unchanged = patch_hash != "unknown"
+            && old_version.ends_with(&format!("-{}", patch_hash));
+        if !head_unchanged {
+            version_info.smart_bump_version(&patch_hash);
+        }
         
         // 检查是否有变化
         if version_info.version != old_version || version_info.version_code != old_code {
@@ -657,21 +668,17 @@ fn normalize_path(path: &Path) -> String {
 }
 
 /// 生成基于日期和递增的版本代码
-fn generate_version_code(project_path: &Path) -> String {
+///
+/// 直接基于调用方已读取的当前版本代码递增，无需再次读取 module.prop
+fn generate_version_code(current_code: &str) -> String {
     // 获取当前日期 YYYYMMDD 格式
     let now = chrono::Local::now();
     let date_str = now.format("%Y%m%d").to_string();
     
-    // 尝试从现有版本代码中提取递增数字
-    if let Ok(current_version) = VersionInfo::from_module_prop(project_path) {
-        let current_code = &current_version.version_code;
-        
-        // 如果当前版本代码是今天的日期开头，提取并递增后缀
-        if current_code.starts_with(&date_str) {
-            let suffix = &current_code[date_str.len()..];
-            if let Ok(num) = suffix.parse::<u32>() {
-                return format!("{}{:02}", date_str, num + 1);
-            }
+    // 如果当前版本代码是今天的日期开头，提取并递增后缀
+    if let Some(suffix) = current_code.strip_prefix(date_str.as_str()) {
+        if let Ok(num) = suffix.parse::<u32>() {
+            return format!("{}{:02}", date_str, num + 1);
         }
     }
     
@@ -679,35 +686,54 @@ fn generate_version_code(project_path: &Path) -> String {
     format!("{}01", date_str)
 }
 
+/// 获取项目所在仓库 HEAD 提交的 8 位 hash，无法获取时返回 "unknown"
+///
+/// 常见情况直接读取 .git/HEAD 与松散引用文件；packed-refs、worktree 等情况回退到 git2
+fn head_short_hash(project_path: &Path) -> String {
+    GitAnalyzer::find_git_root(project_path)
+        .ok()
+        .flatten()
+        .and_then(|repo_root| {
+            read_head_commit(&repo_root.join(".git"))
+                .or_else(|| head_commit_via_git2(&repo_root))
+        })
+        .filter(|commit| commit.len() >= 8)
+        .map(|commit| commit[..8].to_string()) // 使用8位commit hash
+        .unwrap_or_else(|| "unknown".to_string())
+}
+
+/// 直接解析 .git 目录中 HEAD 指向的提交，无法直接解析时返回 None
+fn read_head_commit(git_dir: &Path) -> Option<String> {
+    let head = fs::read_to_string(git_dir.join("HEAD")).ok()?;
+    let head = head.trim();
+    
+    let commit = match head.strip_prefix("ref: ") {
+        // 引用已被打包进 packed-refs 时松散文件不存在，交由 git2 处理
+        Some(reference) => fs::read_to_string(git_dir.join(reference)).ok()?,
+        // 分离 HEAD 直接保存提交 hash
+        None => head.to_string(),
+    };
+    let commit = commit.trim();
+    
+    if commit.len() >= 40 && commit.bytes().all(|b| b.is_ascii_hexdigit()) {
+        Some(commit.to_string())
+    } else {
+        None
+    }
+}
+
+/// 通过 git2 获取 HEAD 提交
+fn head_commit_via_git2(repo_root: &Path) -> Option<String> {
+    let repo = git2::Repository::open(repo_root).ok()?;
+    let commit = repo.head().ok()?.target()?;
+    Some(commit.to_string())
+}
+
 /// 智能版本升级 - 修正版本格式，patch使用Git提交hash
-fn smart_version_bump(current_version: &str, project_path: &Path) -> String {
+fn smart_version_bump(current_version: &str, patch_hash: &str) -> String {
     // 移除可能的 'v' 前缀进行处理
     let version_without_v = current_version.trim_start_matches('v');
     
-    // 获取Git提交hash作为patch
-    let patch_hash = if let Ok(Some(git_info)) = GitAnalyzer::analyze_git_info(project_path) {
-        if let Ok(repo) = git2::Repository::open(&git_info.repo_root) {
-            if let Ok(head) = repo.head() {
-                if let Some(commit) = head.target() {
-                    let commit_str = commit.to_string();
-                    if commit_str.len() >= 8 {
-                        commit_str[..8].to_string() // 使用8位commit hash
-                    } else {
-                        "unknown".to_string()
-                    }
-                } else {
-                    "unknown".to_string()
-                }
-            } else {
-                "unknown".to_string()
-            }
-        } else {
-            "unknown".to_string()
-        }
-    } else {
-        "unknown".to_string()
-    };
-    
     // 检查当前版本是否已经包含patch部分
     if let Some(dash_pos) = version_without_v.find('-') {
         // 已经有patch部分，只升级基础版本号（不重复添加patch）
@@ -769,11 +795,12 @@ fn sync_update_json(project_path: &Path, version_info: &VersionInfo) -> Result<(
                     obj.insert("versionCode".to_string(), serde_json::Value::Number(serde_json::Number::from(version_code_num)));
                 }
                 
-                // 写回文件，保持格式美观
+                // 写回文件，保持格式美观；内容未变化时跳过写入
                 let formatted_json = serde_json::to_string_pretty(&json_value)?;
-                fs::write(&update_json_path, formatted_json)?;
-                
-                println!("    📄 已同步版本信息到 update.json");
+                if formatted_json != content {
+                    fs::write(&update_json_path, formatted_json)?;
+                    println!("    📄 已同步版本信息到 update.json");
+                }
             }
         }
     }
@@ -860,4 +887,89 @@ mod tests {    use super::*;
         // 应该能够处理不存在的项目
         assert!(result.is_ok());
     }
+
+    const HASH: &str = "0123456789abcdef0123456789abcdef01234567";
+
+    /// 在临时目录中写出最小的 .git 结构（HEAD 与可选的松散引用）
+    fn fake_git_dir(head: &str, loose_ref: Option<(&str, &str)>) -> TempDir {
+        let temp_dir = TempDir::new().unwrap();
+        let git_dir = temp_dir.path().join(".git");
+        fs::create_dir_all(&git_dir).unwrap();
+        fs::write(git_dir.join("HEAD"), head).unwrap();
+        if let Some((name, commit)) = loose_ref {
+            let ref_path = git_dir.join(name);
+            fs::create_dir_all(ref_path.parent().unwrap()).unwrap();
+            fs::write(ref_path, format!("{}\n", commit)).unwrap();
+        }
+        temp_dir
+    }
+
+    /// 用 git2 创建带一次提交的仓库，返回提交 hash 与 HEAD 引用名
+    fn repo_with_commit() -> (TempDir, String, String) {
+        let temp_dir = TempDir::new().unwrap();
+        let repo = git2::Repository::init(temp_dir.path()).unwrap();
+        let sig = git2::Signature::now("test", "test@example.com").unwrap();
+        let tree_id = repo.index().unwrap().write_tree().unwrap();
+        let tree = repo.find_tree(tree_id).unwrap();
+        let oid = repo.commit(Some("HEAD"), &sig, &sig, "init", &tree, &[]).unwrap();
+        let ref_name = repo.head().unwrap().name().unwrap().to_string();
+        (temp_dir, oid.to_string(), ref_name)
+    }
+
+    #[test]
+    fn test_read_head_commit_loose_ref() {
+        let temp_dir = fake_git_dir("ref: refs/heads/main\n", Some(("refs/heads/main", HASH)));
+        let git_dir = temp_dir.path().join(".git");
+        assert_eq!(read_head_commit(&git_dir).as_deref(), Some(HASH));
+    }
+
+    #[test]
+    fn test_read_head_commit_detached() {
+        let temp_dir = fake_git_dir(&format!("{}\n", HASH), None);
+        let git_dir = temp_dir.path().join(".git");
+        assert_eq!(read_head_commit(&git_dir).as_deref(), Some(HASH));
+    }
+
+    #[test]
+    fn test_read_head_commit_unresolvable() {
+        // 松散引用不存在（已打包或尚无提交）
+        let missing = fake_git_dir("ref: refs/heads/main\n", None);
+        assert_eq!(read_head_commit(&missing.path().join(".git")), None);
+        // 内容不是合法的对象名
+        let garbage = fake_git_dir("ref: refs/heads/main\n", Some(("refs/heads/main", "not-a-hash")));
+        assert_eq!(read_head_commit(&garbage.path().join(".git")), None);
+        // .git 目录不存在（例如 worktree 中 .git 是文件）
+        let empty = TempDir::new().unwrap();
+        assert_eq!(read_head_commit(&empty.path().join(".git")), None);
+    }
+
+    #[test]
+    fn test_head_short_hash_loose_ref() {
+        let (temp_dir, commit, _) = repo_with_commit();
+        assert_eq!(head_short_hash(temp_dir.path()), commit[..8]);
+    }
+
+    #[test]
+    fn test_head_short_hash_packed_ref_falls_back_to_git2() {
+        let (temp_dir, commit, ref_name) = repo_with_commit();
+        let git_dir = temp_dir.path().join(".git");
+        
+        // 把分支引用移入 packed-refs，直接读取文件的路径无法解析
+        fs::remove_file(git_dir.join(&ref_name)).unwrap();
+        fs::write(
+            git_dir.join("packed-refs"),
+            format!("# pack-refs with: peeled fully-peeled sorted \n{} {}\n", commit, ref_name),
+        )
+        .unwrap();
+        assert_eq!(read_head_commit(&git_dir), None);
+        
+        assert_eq!(head_short_hash(temp_dir.path()), commit[..8]);
+    }
+
+    #[test]
+    fn test_head_short_hash_unborn_branch() {
+        let temp_dir = TempDir::new().unwrap();
+        git2::Repository::init(temp_dir.path()).unwrap();
+        assert_eq!(head_short_hash(temp_dir.path()), "unknown");
+    }
 }
@@ -6,10 +6,20 @@ use std::env;
 use std::fs;
 use std::path::{Path, PathBuf};
 use std::sync::{Arc, Mutex};
-use std::time::{Duration, Instant};
+use std::time::{Duration, Instant, SystemTime};
 use toml;
 use walkdir::WalkDir;
 
+/// 不允许作为项目名称的目录名（构建产物和系统目录）
+const BLACKLISTED_PROJECT_NAMES: &[&str] = &[
+    "build", "source-build", "dist", "target", "node_modules",
+    ".git", ".vscode", "tmp", "temp", "cache", "output",
+    ".rmmp", "out", "bin", "obj", ".next", "coverage"
+];
+
+/// Git 缓存签名：.git 下 HEAD、config、index 的修改时间
+type GitSignature = [Option<SystemTime>; 3];
+
 /// 缓存项结构
 #[derive(Debug, Clone)]
 struct CacheItem<T> {
@@ -178,22 +188,11 @@ impl GitAnalyzer {
     
     /// 查找 Git 根目录
     pub fn find_git_root(path: &Path) -> Result<Option<PathBuf>> {
-        let mut current = path.to_path_buf();
-        
-        loop {
-            let git_dir = current.join(".git");
-            if git_dir.exists() {
-                return Ok(Some(current));
-            }
-            
-            if let Some(parent) = current.parent() {
-                current = parent.to_path_buf();
-            } else {
-                break;
-            }
-        }
-        
-        Ok(None)
+        // 借用遍历祖先目录，只在找到时分配返回值
+        Ok(path
+            .ancestors()
+            .find(|dir| dir.join(".git").exists())
+            .map(Path::to_path_buf))
     }
     
     /// 获取当前分支名
@@ -262,9 +261,11 @@ pub struct RmmCore {
     rmm_root: PathBuf,
     meta_cache: Arc<Mutex<Option<CacheItem<MetaConfig>>>>,
     project_cache: Arc<Mutex<HashMap<String, CacheItem<RmmProject>>>>,
+    /// Rmake.toml 配置缓存
+    rmake_cache: Arc<Mutex<HashMap<String, CacheItem<RmakeConfig>>>>,
     cache_ttl: Duration,
     /// Git 信息缓存
-    git_cache: Arc<Mutex<HashMap<PathBuf, (GitInfo, Instant)>>>,
+    git_cache: Arc<Mutex<HashMap<PathBuf, (GitInfo, Instant, GitSignature)>>>,
 
 }
 
@@ -274,6 +275,7 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
             rmm_root: Self::get_rmm_root_path(),
             meta_cache: Arc::new(Mutex::new(None)),
             project_cache: Arc::new(Mutex::new(HashMap::new())),
+            rmake_cache: Arc::new(Mutex::new(HashMap::new())),
             cache_ttl: Duration::from_secs(60), // 60秒缓存
             git_cache: Arc::new(Mutex::new(HashMap::new())),
         }
@@ -390,12 +392,7 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
             }
             
             // 2. 黑名单检查 - 排除构建相关目录和系统目录
-            let blacklisted_names = [
-                "build", "source-build", "dist", "target", "node_modules", 
-                ".git", ".vscode", "tmp", "temp", "cache", "output",
-                ".rmmp", "out", "bin", "obj", ".next", "coverage"
-            ];
-            if blacklisted_names.contains(&name.as_str()) {
+            if BLACKLISTED_PROJECT_NAMES.contains(&name.as_str()) {
                 #[cfg(debug_assertions)]
                 eprintln!("🚫 项目名称 '{}' 在黑名单中", name);
                 results.insert(name.clone(), false);
@@ -413,11 +410,9 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
             }
             
             // 4. 检查项目路径和文件是否存在
-            let path_valid = project_path.exists() && 
-                           project_path.is_dir() && 
-                           project_path.join("rmmproject.toml").exists() &&
-                           project_path.join(".rmmp").exists() &&
-                           project_path.join(".rmmp").join("Rmake.toml").exists();
+            // 子文件存在即隐含项目目录与 .rmmp 目录存在，只需两次 stat
+            let path_valid = project_path.join("rmmproject.toml").is_file() &&
+                           project_path.join(".rmmp").join("Rmake.toml").is_file();
             
             if !path_valid {
                 #[cfg(debug_assertions)]
@@ -454,6 +449,10 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
         };
         
         for entry in walker.into_iter().filter_map(|e| e.ok()) {
+            // 目录项类型来自目录读取结果，普通文件直接跳过，避免额外的 stat
+            if entry.file_type().is_file() {
+                continue;
+            }
             let path = entry.path();
             
             // 跳过 .rmmp 目录下的所有子目录（这些是构建产物）
@@ -495,12 +494,7 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
                 eprintln!("🔍 正在验证项目名称: '{}' 在路径: {} (canonical: {})", name, path.display(), canonical_path.display());
                 
                 // 黑名单检查 - 排除构建相关目录
-                let blacklisted_names = [
-                    "build", "source-build", "dist", "target", "node_modules", 
-                    ".git", ".vscode", "tmp", "temp", "cache", "output",
-                    ".rmmp", "out", "bin", "obj", ".next", "coverage"
-                ];
-                if blacklisted_names.contains(&name.as_str()) {
+                if BLACKLISTED_PROJECT_NAMES.contains(&name.as_str()) {
                     #[cfg(debug_assertions)]
                     eprintln!("🚫 项目名称 '{}' 在黑名单中，跳过", name);
                     continue;
@@ -517,9 +511,7 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
                 eprintln!("✅ 项目名称 '{}' 验证通过", name);
                 
                 // 检查是否是完整的 RMM 项目
-                let rmmp_dir = path.join(".rmmp");
-                let rmake_file = rmmp_dir.join("Rmake.toml");
-                let is_valid = rmmp_dir.exists() && rmake_file.exists();
+                let is_valid = path.join(".rmmp").join("Rmake.toml").is_file();
                 
                 // 获取 Git 信息
                 let git_info = GitAnalyzer::analyze_git_info(path).ok().flatten();
@@ -645,6 +637,18 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
 
     /// 读取项目根目录下的 .rmmp/Rmake.toml 文件
     pub fn get_rmake_config(&self, project_path: &Path) -> Result<RmakeConfig> {
+        let project_key = project_path.to_string_lossy().to_string();
+
+        // 检查缓存
+        {
+            let cache = self.rmake_cache.lock().unwrap();
+            if let Some(cached) = cache.get(&project_key) {
+                if !cached.is_expired() {
+                    return Ok(cached.data.clone());
+                }
+            }
+        }
+
         let rmake_file = project_path.join(".rmmp").join("Rmake.toml");
         let content = fs::read_to_string(&rmake_file)
             .with_context(|| format!("Failed to read Rmake.toml from {}", rmake_file.display()))?;
@@ -652,6 +656,12 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
         let rmake: RmakeConfig = toml::from_str(&content)
             .with_context(|| "Failed to parse Rmake.toml")?;
 
+        // 更新缓存
+        {
+            let mut cache = self.rmake_cache.lock().unwrap();
+            cache.insert(project_key, CacheItem::new(rmake.clone(), self.cache_ttl));
+        }
+
         Ok(rmake)
     }
 
@@ -670,6 +680,13 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
         fs::write(&rmake_file, content)
             .with_context(|| format!("Failed to write Rmake.toml to {}", rmake_file.display()))?;
 
+        // 更新缓存
+        let project_key = project_path.to_string_lossy().to_string();
+        {
+            let mut cache = self.rmake_cache.lock().unwrap();
+            cache.insert(project_key, CacheItem::new(rmake.clone(), self.cache_ttl));
+        }
+
         Ok(())
     }
 
@@ -703,24 +720,16 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
             cmd
         };
         
-        let output = cmd.output()
+        // 子进程继承当前 stdout/stderr，输出实时流式显示，不在内存中缓存
+        let status = cmd.status()
             .with_context(|| format!("执行脚本 '{}' 失败", script_name))?;
         
-        // 输出结果
-        if !output.stdout.is_empty() {
-            print!("{}", String::from_utf8_lossy(&output.stdout));
-        }
-        
-        if !output.stderr.is_empty() {
-            eprint!("{}", String::from_utf8_lossy(&output.stderr));
-        }
-        
         // 检查执行结果
-        if !output.status.success() {
+        if !status.success() {
             return Err(anyhow::anyhow!(
                 "脚本 '{}' 执行失败，退出代码: {:?}", 
                 script_name, 
-                output.status.code()
+                status.code()
             ));
         }
         
@@ -755,6 +764,12 @@ impl RmmCore {    /// 创建新的 RmmCore 实例
             let mut cache = self.project_cache.lock().unwrap();
             cache.retain(|_, cached| !cached.is_expired());
         }
+
+        // 清理 Rmake 配置缓存
+        {
+            let mut cache = self.rmake_cache.lock().unwrap();
+            cache.retain(|_, cached| !cached.is_expired());
+        }
     }
 
     /// 获取缓存统计信息
@@ -876,45 +891,70 @@ impl RmmCore {
 
 impl RmmCore {/// 检测给定路径是否在 Git 仓库中，并返回详细信息
     pub fn get_git_info(&self, path: &Path) -> Result<GitInfo> {
-        let canonical_path = path.canonicalize()
-            .map_err(|e| anyhow::anyhow!("无法获取路径的绝对路径: {}", e))?;
+        let canonicalize = |p: &Path| {
+            p.canonicalize()
+                .map_err(|e| anyhow::anyhow!("无法获取路径的绝对路径: {}", e))
+        };
         
-        // 检查缓存
+        // 绝对路径按原样作为缓存键，命中时无需 canonicalize；
+        // 相对路径依赖当前目录，仍先规范化再作为键
+        let cache_key = if path.is_absolute() {
+            path.to_path_buf()
+        } else {
+            canonicalize(path)?
+        };
+        
+        // 检查缓存：未过期且 .git 关键文件未变化时直接返回
         {
             let cache = self.git_cache.lock().unwrap();
-            if let Some((git_info, cached_time)) = cache.get(&canonical_path) {
-                if cached_time.elapsed() < self.cache_ttl {
+            if let Some((git_info, cached_time, signature)) = cache.get(&cache_key) {
+                if cached_time.elapsed() < self.cache_ttl
+                    && *signature == Self::git_signature(&git_info.repo_root)
+                {
                     return Ok(git_info.clone());
                 }
             }
         }
         
+        // 分析时始终使用规范路径，保证 `..`、符号链接等情况下仓库匹配与相对路径正确
+        let canonical_path = if path.is_absolute() {
+            canonicalize(path)?
+        } else {
+            cache_key.clone()
+        };
         let git_info = self.analyze_git_info(&canonical_path)?;
+        let signature = Self::git_signature(&git_info.repo_root);
         
         // 更新缓存
         {
             let mut cache = self.git_cache.lock().unwrap();
-            cache.insert(canonical_path, (git_info.clone(), Instant::now()));
+            cache.insert(cache_key, (git_info.clone(), Instant::now(), signature));
         }
         
         Ok(git_info)
     }
     
+    /// 读取影响 Git 信息的文件修改时间，仓库不存在时各项为 None
+    fn git_signature(repo_root: &Path) -> GitSignature {
+        if repo_root.as_os_str().is_empty() {
+            return [None; 3];
+        }
+        let git_path = repo_root.join(".git");
+        let modified = |name: &str| fs::metadata(git_path.join(name)).and_then(|m| m.modified()).ok();
+        [modified("HEAD"), modified("config"), modified("index")]
+    }
+    
     /// 分析路径的 Git 信息
     fn analyze_git_info(&self, path: &Path) -> Result<GitInfo> {
-        let mut current_path = path.to_path_buf();
-        let original_path = path.to_path_buf();
-        
         // 向上遍历寻找 .git 文件夹
-        loop {
-            let git_path = current_path.join(".git");
-            if git_path.exists() {
-                let relative_path = original_path.strip_prefix(&current_path)
+        for current_path in path.ancestors() {
+            if current_path.join(".git").exists() {
+                let relative_path = path.strip_prefix(current_path)
                     .unwrap_or(Path::new(""))
                     .to_path_buf();
                 
                 let mut git_info = GitInfo {
-                    repo_root: current_path.clone(),
+                    repo_root: current_path.to_path_buf(),
                     relative_path,
                     branch: String::new(),
                     remote_url: None,
@@ -924,15 +964,10 @@ impl RmmCore {/// 检测给定路径是否在 Git 仓库中，并返回详细信
                 };
                 
                 // 读取更多 Git 信息
-                self.read_git_details(&current_path, &mut git_info)?;
+                self.read_git_details(current_path, &mut git_info)?;
                 
                 return Ok(git_info);
             }
-            
-            match current_path.parent() {
-                Some(parent) => current_path = parent.to_path_buf(),
-                None => break,
-            }
         }
         
         // 没有找到 Git 仓库
@@ -1067,7 +1102,7 @@ impl RmmCore {/// 检测给定路径是否在 Git 仓库中，并返回详细信
     pub fn cleanup_expired_git_cache(&self) {
         let mut cache = self.git_cache.lock().unwrap();
         let now = Instant::now();
-        cache.retain(|_, (_, cached_time)| now.duration_since(*cached_time) < self.cache_ttl);
+        cache.retain(|_, (_, cached_time, _)| now.duration_since(*cached_time) < self.cache_ttl);
     }
 }
 
@@ -1127,6 +1162,10 @@ impl RmmCore {    /// 从meta配置中移除项目
             let mut cache = self.project_cache.lock().unwrap();
             cache.clear();
         }
+        {
+            let mut cache = self.rmake_cache.lock().unwrap();
+            cache.clear();
+        }
         {
             let mut cache = self.git_cache.lock().unwrap();
             cache.clear();
@@ -1138,13 +1177,15 @@ impl RmmCore {    /// 从meta配置中移除项目
 /// 规则：^[a-zA-Z][a-zA-Z0-9._-]+$
 /// - 必须以字母开头
 /// - 后续字符可以是字母、数字、点、下划线或连字符
-fn is_valid_project_name(name: &str) -> bool {
-    use regex::Regex;
-    
-    // 创建正则表达式
-    let re = Regex::new(r"^[a-zA-Z][a-zA-Z0-9._-]+$").unwrap();
-    
-    // 验证名称
-    re.is_match(name) && name.len() >= 2 // 至少2个字符
+/// - 至少2个字符
+///
+/// 规则只涉及 ASCII 字符类，逐字节判断即可，无需每次编译正则表达式
+pub fn is_valid_project_name(name: &str) -> bool {
+    let bytes = name.as_bytes();
+    bytes.len() >= 2
+        && bytes[0].is_ascii_alphabetic()
+        && bytes[1..]
+            .iter()
+            .all(|&b| b.is_ascii_alphanumeric() || matches!(b, b'.' | b'_' | b'-'))
 }
 
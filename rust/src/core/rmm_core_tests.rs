@@ -509,4 +509,49 @@ build-backend = "rmm"
         println!("✅ 缓存清理测试通过");
         Ok(())
     }
+
+    #[test]
+    fn test_is_valid_project_name_matches_regex() {
+        use crate::core::rmm_core::is_valid_project_name;
+        
+        // 与原先使用的正则规则逐一对照
+        let legacy = regex::Regex::new(r"^[a-zA-Z][a-zA-Z0-9._-]+$").unwrap();
+        let cases: &[(&str, bool)] = &[
+            // KernelSU 文档中的示例
+            ("a_module", true),
+            ("a.module", true),
+            ("module-101", true),
+            ("a module", false),
+            ("1_module", false),
+            ("-a-module", false),
+            // 边界情况
+            ("", false),
+            ("a", false),
+            ("ab", true),
+            ("A1", true),
+            ("Z.", true),
+            ("a-", true),
+            ("_a", false),
+            (".a", false),
+            ("a/b", false),
+            ("a\\b", false),
+            ("a+b", false),
+            ("a\nb", false),
+            ("ab\n", false),
+            ("ä_module", false),
+            ("aé", false),
+            ("a模块", false),
+            ("mod_ID.v2-x", true),
+        ];
+        
+        for (name, expected) in cases {
+            assert_eq!(is_valid_project_name(name), *expected, "name: {:?}", name);
+            assert_eq!(
+                is_valid_project_name(name),
+                legacy.is_match(name) && name.len() >= 2,
+                "与正则结果不一致: {:?}",
+                name
+            );
+        }
+    }
 }
@@ -96,7 +96,7 @@ fn cli() -> PyResult<()> {
             }
         },
           // 构建命令
-        Some(Commands::Build { project_path, no_auto_fix, script }) => {
+        Some(Commands::Build { project_path, no_auto_fix, level, script }) => {
             // 确定项目路径
             let target_path = if let Some(path) = project_path {
                 PathBuf::from(path)
@@ -143,7 +143,7 @@ fn cli() -> PyResult<()> {
             } else {
                 // 执行构建，传递自动修复参数
                 let auto_fix = !no_auto_fix;  // 默认启用自动修复，除非用户明确禁用
-                match cmds::build::build_project_with_options(&project_path, auto_fix) {
+                match cmds::build::build_project_with_options(&project_path, auto_fix, level) {
                     Ok(()) => {
                         println!("{} 构建成功！", "✅".green().bold());
                     }                    Err(e) => {
@@ -1,12 +1,23 @@
 from pathlib import Path
+import copy
 import os
-import toml
+import tomllib
 from typing import Any
+from functools import lru_cache
 from contextlib import contextmanager
 from argparse import ArgumentParser
 from mcp.server.fastmcp import FastMCP
+from ..utils.paths import DEFAULT_RMMROOT
 
 
+@lru_cache(maxsize=256)
+def _load_project_toml(path: str, mtime_ns: int, size: int) -> dict[str, Any]:
+    """
+    解析项目的 rmmproject.toml，按 (路径, mtime_ns, 大小) 缓存。
+    文件变化后签名不同自动重新解析，缓存条目数有上限。
+    """
+    return tomllib.loads(Path(path).read_text(encoding="utf-8"))
+
 class RmMcp(FastMCP):
     """
     RmMcp class that extends FastMCP with configuration management capabilities.
@@ -23,12 +34,12 @@ class RmMcp(FastMCP):
             "version": "0.2.3",
             "projects": {}
         }
-        self._cache_last_modified: float = 0
+        self._cache_last_modified: tuple[int, int] = (0, 0)
 
     @property
     def ROOT(self) -> Path:
         """Get the root directory for RMM configuration."""
-        return Path(os.getenv("RMM_ROOT", Path().home() / "data" / "adb" / ".rmm"))
+        return Path(os.getenv("RMM_ROOT", DEFAULT_RMMROOT))
 
     @property
     def META_FILE(self) -> Path:
@@ -36,33 +47,28 @@ class RmMcp(FastMCP):
         return self.ROOT / "meta.toml"
 
     @property
-    def _true_last_modified(self) -> float:
-        """Get the actual last modified time of the metadata file."""
-        try:
-            return self.META_FILE.stat().st_mtime
-        except FileNotFoundError:
-            return 0
-
-    @property
-    def is_changed(self) -> bool:
+    def _true_last_modified(self) -> tuple[int, int]:
         """
-        Check if the cache has changed since the last load.
+        Get the (mtime_ns, size) signature of the metadata file.
+        Nanosecond mtime plus size catches edits within the same second.
         """
-        true_modified = self._true_last_modified
-        if self._cache_last_modified != true_modified:
-            self._cache_last_modified = true_modified
-            return True
-        return False
+        try:
+            stat = self.META_FILE.stat()
+            return (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return (0, 0)
 
     @property
     def META(self) -> dict[str, Any]:
         """
         Get the metadata from the TOML file, loading it if necessary.
         """
-        if self._cache_last_modified == 0 or self._true_last_modified == 0 or self.is_changed:
+        # 只 stat 一次；签名未变化时直接返回缓存，不再重复解析 TOML
+        signature = self._true_last_modified
+        if signature == (0, 0) or signature != self._cache_last_modified:
             try:
-                with open(self.META_FILE, "r", encoding="utf-8") as f:
-                    self.cache = toml.load(f)
+                self.cache = tomllib.loads(self.META_FILE.read_text(encoding="utf-8"))
+                self._cache_last_modified = signature
             except FileNotFoundError:
                 # If file doesn't exist, create the directory and use default cache
                 self.ROOT.mkdir(parents=True, exist_ok=True)        
@@ -91,16 +97,17 @@ class RmMcp(FastMCP):
         """
         project_path = self.project_path(project_id)
         project_info_file: Path = project_path / "rmmproject.toml"
-        if project_info_file.exists():
-            try:
-                with open(project_info_file, "r", encoding="utf-8") as f:
-                    return toml.load(f)
-            except Exception as e:
-                print(f"读取项目 {project_id} 信息失败: {e}")
-                return {}
-        else:
+        # 只 stat 一次：既判断文件是否存在，又作为缓存签名
+        try:
+            stat = project_info_file.stat()
+            # 返回深拷贝：解析结果含嵌套表，避免调用方修改到缓存中的数据
+            return copy.deepcopy(_load_project_toml(str(project_info_file), stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
             print(f"项目 {project_id} 的信息文件不存在: {project_info_file}")
             return {f"项目 {project_id} 的信息文件不存在": str(project_info_file)}
+        except Exception as e:
+            print(f"读取项目 {project_id} 信息失败: {e}")
+            return {}
 
 
 # 创建全局 MCP 实例
@@ -6,17 +6,48 @@ from typing import Any
 import subprocess
 import re
 import json
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
-from rich.tree import Tree
-from rich.align import Align
-from typing import Any
 
 # 初始化 rich console
 console = Console()
 
+# 并行上传 Release 文件的线程数
+UPLOAD_WORKERS = 4
+
+# Release 文件类型说明，按文件名后缀匹配
+ASSET_KINDS: dict[str, str] = {
+    ".json": "更新配置文件",
+    ".zip": "模块包",
+    ".tar.gz": "源码包",
+}
+
+# 代理模块不可用时的回退代理列表
+FALLBACK_PROXIES: tuple[str, ...] = (
+    "https://ghproxy.com/",
+    "https://mirror.ghproxy.com/",
+    "https://ghps.cc/",
+    "https://gh-proxy.com/",
+    "https://ghproxy.net/",
+    "https://hub.gitmirror.com/",
+)
+
+# 仓库地址解析用的正则，模块加载时编译一次
+TOML_GITHUB_URL_RE = re.compile(r'\[urls\].*?github\s*=\s*"([^"]+)"', re.DOTALL)
+GITHUB_URL_REPO_RE = re.compile(r"github.com/([^/]+/[^/]+?)/?$")
+# 远程地址长度上限，超长输入直接拒绝，避免正则回溯开销
+MAX_REMOTE_URL_LENGTH = 1024
+# 支持的 GitHub 远程地址前缀，用于在正则匹配前快速排除
+GITHUB_REMOTE_PREFIXES: tuple[str, ...] = ("https://github.com/", "git@github.com:")
+# HTTPS 与 SSH 两种格式合并为一个正则
+GITHUB_REMOTE_RE = re.compile(r"^(?:https://github\.com/|git@github\.com:)([^/]+/[^/]+?)(?:\.git)?/?$")
+# Release 文件名（zip / tar.gz）与 module.prop 中的 updateJson 链接
+RELEASE_ASSET_NAME_RE = re.compile(r"/([^/]+)\.(zip|tar\.gz)$")
+UPDATE_JSON_URL_RE = re.compile(r"updateJson=(https://github\.com/[^\s]+)")
+# .git/config 的节头（如 [remote "origin"]）与 url 键
+GIT_CONFIG_SECTION_RE = re.compile(r'^\s*\[\s*([A-Za-z0-9.-]+)(?:\s+"([^"]*)")?\s*\]')
+GIT_CONFIG_URL_RE = re.compile(r"^\s*url\s*=\s*(.*?)\s*$")
+
 def success(message: str) -> None:
     """打印成功消息"""
     console.print(f"[bold green]✅ {message}[/bold green]")
@@ -39,6 +70,11 @@ def step(message: str) -> None:
 
 def print_banner(title: str, subtitle: str = "") -> None:
     """打印美化的横幅"""
+    # 仅在需要展示时加载 rich 的渲染组件
+    from rich.align import Align
+    from rich.panel import Panel
+    from rich.text import Text
+    
     text = Text(title, style="bold white")
     panel = Panel(
         Align.center(text),
@@ -51,6 +87,8 @@ def print_banner(title: str, subtitle: str = "") -> None:
 
 def print_table(title: str, data: dict[str, Any]) -> None:
     """打印美化的表格"""
+    from rich.table import Table
+    
     table = Table(title=title, style="cyan")
     table.add_column("属性", style="bold yellow", no_wrap=True)
     table.add_column("值", style="green")
@@ -62,6 +100,8 @@ def print_table(title: str, data: dict[str, Any]) -> None:
 
 def print_file_tree(files: list[Path], title: str = "目标文件") -> None:
     """打印文件树"""
+    from rich.tree import Tree
+    
     tree = Tree(f"[bold blue]{title}[/bold blue]")
     for file in files:
         tree.add(f"[green]{file.name}[/green]")
@@ -79,6 +119,32 @@ def is_rmmp(project_path: Path = Path.cwd()) -> bool:
     """
     return (project_path / "rmmproject.toml").exists()
 
+def read_origin_url(git_dir: Path) -> str | None:
+    """
+    直接解析 .git/config 获取 origin 的远程地址，避免启动 git 子进程。
+    
+    参数:
+        git_dir (Path): .git 目录路径
+        
+    返回:
+        str | None: origin 的 url，未找到时返回 None
+    """
+    config_file = git_dir / "config"
+    if not config_file.is_file():
+        return None
+    
+    in_origin = False
+    for line in config_file.read_text(encoding="utf-8", errors="replace").splitlines():
+        section = GIT_CONFIG_SECTION_RE.match(line)
+        if section:
+            in_origin = section.group(1).lower() == "remote" and section.group(2) == "origin"
+            continue
+        if in_origin:
+            url_match = GIT_CONFIG_URL_RE.match(line)
+            if url_match:
+                return url_match.group(1).strip('"')
+    return None
+
 def get_repo_name(project_path: Path) -> str | None:
     """
     从 rmmproject.toml 或 .git 文件夹获取 GitHub 仓库名。
@@ -97,12 +163,12 @@ def get_repo_name(project_path: Path) -> str | None:
             content = rmmproject_file.read_text(encoding="utf-8")
             
             # 简单解析 [urls] 部分的 github 字段
-            github_match = re.search(r'\[urls\].*?github\s*=\s*"([^"]+)"', content, re.DOTALL)
+            github_match = TOML_GITHUB_URL_RE.search(content)
             if github_match:
                 github_url = github_match.group(1)                # 解析 GitHub URL
                 if "github.com" in github_url:
                     # HTTPS: https://github.com/owner/repo
-                    match = re.search(r"github.com/([^/]+/[^/]+?)/?$", github_url)
+                    match = GITHUB_URL_REPO_RE.search(github_url)
                     if match:
                         repo_name = match.group(1)
                         success(f"从 rmmproject.toml 获取到仓库名: {repo_name}")
@@ -113,40 +179,32 @@ def get_repo_name(project_path: Path) -> str | None:
     # 如果从 rmmproject.toml 获取失败，尝试从 git 获取
     info("尝试从 git 获取仓库名...")
     try:
-        git_dir = project_path / ".git"
-        if not git_dir.exists():
-            # 查找上级目录中的 .git
-            current = project_path
-            while current.parent != current:
-                git_dir = current / ".git"
-                if git_dir.exists():
-                    break
-                current = current.parent
-            else:
-                return None
-        
-        # 尝试使用 git remote get-url origin
-        result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            cwd=project_path,
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        # 自项目目录起向上查找 .git，每层只 stat 一次
+        for current in (project_path, *project_path.parents):
+            git_dir = current / ".git"
+            if git_dir.exists():
+                break
+        else:
+            return None
         
-        remote_url = result.stdout.strip()
+        # 优先直接读取 .git/config，读取不到时再使用 git remote get-url origin
+        remote_url = read_origin_url(git_dir)
+        if remote_url is None:
+            result = subprocess.run(
+                ["git", "remote", "get-url", "origin"],
+                cwd=project_path,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            remote_url = result.stdout.strip()
         
         # 解析 GitHub URL
         # 支持 HTTPS 和 SSH 格式
-        if "github.com" in remote_url:
+        if len(remote_url) <= MAX_REMOTE_URL_LENGTH and remote_url.startswith(GITHUB_REMOTE_PREFIXES):
             # HTTPS: https://github.com/owner/repo.git
             # SSH: git@github.com:owner/repo.git
-            if remote_url.startswith("https://github.com/"):
-                match = re.search(r"https://github.com/([^/]+/[^/]+?)(?:\.git)?/?$", remote_url)
-            elif remote_url.startswith("git@github.com:"):
-                match = re.search(r"git@github.com:([^/]+/[^/]+?)(?:\.git)?/?$", remote_url)
-            else:
-                return None
+            match = GITHUB_REMOTE_RE.match(remote_url)
             if match:
                 repo_name = match.group(1)
                 success(f"从 git 获取到仓库名: {repo_name}")
@@ -223,7 +281,7 @@ def publish(args: list[Any]) -> None:
         error(f"路径 {project_path} 不是一个有效的 RMM 项目目录。")
         return    # 显示发布标题
     print_banner("🚀 RMM 项目发布工具", f"项目路径: {project_path}")
-    from github import Github
+    from github import Github, UnknownObjectException
     GITHUB_TOKEN = os.getenv("GITHUB_ACCESS_TOKEN",os.getenv("GITHUB_TOKEN","")) 
     if not GITHUB_TOKEN:
         info("请设置环境变量 GITHUB_ACCESS_TOKEN 或 GITHUB_TOKEN。")
@@ -262,10 +320,10 @@ def publish(args: list[Any]) -> None:
 
         # 将 version_code 转换为字符串以便进行字符串匹配
         version_code_str = str(version_code)
-        target_files: list[Path] = []
-        for file in (project_path / ".rmmp" / "dist").glob("*"):
-            if version_code_str in file.name:
-                target_files.append(file)
+        target_files: list[Path] = [
+            file for file in (project_path / ".rmmp" / "dist").iterdir()
+            if version_code_str in file.name
+        ]
         
         # 🔥 重要修复：确保 update.json 文件也会被上传
         if updateJson not in target_files:
@@ -325,9 +383,13 @@ def publish(args: list[Any]) -> None:
         release_body = update_data.get('changelog', '无变更日志')
         
         try:
-            # 检查是否已存在该标签的 Release
+            # 检查是否已存在该标签的 Release（仅 404 视为不存在）
             try:
                 existing_release = repo.get_release(tag_name)
+            except UnknownObjectException:
+                existing_release = None
+
+            if existing_release is not None:
                 print(f"⚠️  Release {tag_name} 已存在，将更新现有 Release")
                 release = existing_release
                 # 更新 Release 信息
@@ -337,7 +399,7 @@ def publish(args: list[Any]) -> None:
                     draft=False,
                     prerelease=False
                 )
-            except:
+            else:
                 # 创建新 Release
                 step(f"正在创建 Release: {tag_name}")                #region proxy
 
@@ -351,28 +413,16 @@ def publish(args: list[Any]) -> None:
                     prerelease=False
                 )
                 success(f"✅ 已创建 Release: {release.html_url}")
-              # 上传文件到 Release
+            # 上传文件到 Release（网络 I/O 为主，并行上传）
             print("正在上传文件...")
-            for target_file in target_files:
-                try:
-                    # 检查是否已存在同名文件，如果存在则删除
-                    existing_assets = release.get_assets()
-                    for asset in existing_assets:
-                        if asset.name == target_file.name:
-                            print(f"🔄 删除已存在的文件: {asset.name}")
-                            asset.delete_asset()
-                            break
-                      # 上传新文件
-                    with open(target_file, "rb") as f:
-                        asset = release.upload_asset(
-                            path=str(target_file),
-                            label=target_file.name
-                        )
-                    info(f"✅ 已上传文件: {target_file.name}")
-                    info(f"   下载链接: {asset.browser_download_url}")
-                except Exception as e:
-                    error(f"❌ 上传文件 {target_file.name} 失败: {e}")
-            success(f"🎉 发布完成！")
+            # 只列出一次已有文件，避免每个上传都分页请求一次 assets
+            existing_assets = {asset.name: asset for asset in release.get_assets()}
+            with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as pool:
+                results = list(pool.map(lambda target_file: upload_asset(release, target_file, existing_assets), target_files))
+            if all(results):
+                success(f"🎉 发布完成！")
+            else:
+                warning("部分文件上传失败，请检查上方日志")
             info(f"Release 链接: {release.html_url}")
 
         except Exception as e:
@@ -383,6 +433,90 @@ def publish(args: list[Any]) -> None:
         return
     
 
+def asset_heading(file_name: str) -> str:
+    """
+    生成 Release 说明中文件下载小节的标题。
+
+    参数:
+        file_name (str): 文件名
+
+    返回:
+        str: 形如 "### 📥 name (说明)" 的 Markdown 标题
+    """
+    for suffix, desc in ASSET_KINDS.items():
+        if file_name.endswith(suffix):
+            return f"\n### 📥 {file_name} ({desc})"
+    return f"\n### 📥 {file_name}"
+
+def upload_asset(release: Any, target_file: Path, existing_assets: dict[str, Any]) -> bool:
+    """
+    上传单个文件到 Release，已存在的同名文件会先被删除。
+
+    参数:
+        release: GitHub Release 对象
+        target_file (Path): 要上传的文件
+        existing_assets (dict[str, Any]): Release 中已有文件，按文件名索引
+
+    返回:
+        bool: 上传成功返回 True，否则返回 False
+    """
+    try:
+        # 检查是否已存在同名文件，如果存在则删除
+        existing = existing_assets.get(target_file.name)
+        if existing is not None:
+            console.print(f"🔄 删除已存在的文件: {existing.name}")
+            existing.delete_asset()
+        # 上传新文件
+        asset = release.upload_asset(
+            path=str(target_file),
+            label=target_file.name
+        )
+        info(f"✅ 已上传文件: {target_file.name}\n   下载链接: {asset.browser_download_url}")
+        return True
+    except Exception as e:
+        error(f"❌ 上传文件 {target_file.name} 失败: {e}")
+        return False
+
+def proxy_link_targets(proxies: list[Any]) -> list[tuple[str, str, str]]:
+    """
+    预先计算代理下载链接所需的信息，每个代理只处理一次。
+    
+    参数:
+        proxies (list[Any]): 代理列表（字典或字符串）
+        
+    返回:
+        list[tuple[str, str, str]]: (代理 URL, 代理名称, 显示名称) 列表
+    """
+    targets: list[tuple[str, str, str]] = []
+    for proxy in proxies:
+        try:
+            if isinstance(proxy, dict) and 'url' in proxy:
+                raw_url = str(proxy['url'])
+                proxy_url = raw_url if raw_url.startswith('http') else f"https://{raw_url}"
+                proxy_name = raw_url.replace('https://', '').replace('http://', '')
+                location = str(proxy.get('location', '')).strip()
+                speed_val = proxy.get('speed', 0)
+                # 安全转换 speed 值
+                try:
+                    speed = float(str(speed_val)) if speed_val else 0
+                except (ValueError, TypeError):
+                    speed = 0
+                
+                # 生成显示名称
+                display_name = f"🚀 {proxy_name}"
+                if location:
+                    display_name += f" ({location})"
+                if speed > 0:
+                    display_name += f" - {speed:.1f}MB/s"
+                targets.append((proxy_url, proxy_name, display_name))
+            elif isinstance(proxy, str):
+                proxy_url = proxy if proxy.startswith('http') else f"https://{proxy}"
+                proxy_name = proxy_url.replace('https://', '').replace('http://', '').replace('/', '')
+                targets.append((proxy_url, proxy_name, f"🚀 {proxy_name}"))
+        except Exception as e:
+            warning(f"处理代理失败: {e}")
+    return targets
+
 def proxy_handler(path: Path, target_files: list[Path], release_body: str, repo_name: str, tag_name: str, version_code_str: str) -> str:
     """
     处理代理加速链接
@@ -402,21 +536,25 @@ def proxy_handler(path: Path, target_files: list[Path], release_body: str, repo_
         
         # 获取代理列表和最佳代理
         proxies = get_github_proxies()
-        best_proxy = get_best_github_proxy()
+        best_proxy = get_best_github_proxy(proxy_list=proxies)
         
         info(f"使用最佳代理: {best_proxy}")
         
     except ImportError:
         warning("代理模块未找到，使用默认代理")
         # 回退到默认代理列表
-        proxies = [
-            "https://ghproxy.com/",
-            "https://mirror.ghproxy.com/", 
-            "https://ghps.cc/",
-            "https://gh-proxy.com/",
-            "https://ghproxy.net/",
-            "https://hub.gitmirror.com/"        ]
-        best_proxy = proxies[0]
+        proxies = list(FALLBACK_PROXIES)
+        best_proxy = FALLBACK_PROXIES[0]
+    
+    # 最佳代理的 URL 前缀只规范一次：确保以 http(s) 开头、以 / 结尾
+    best_proxy_prefix = str(best_proxy)
+    if not best_proxy_prefix.endswith('/'):
+        best_proxy_prefix += '/'
+    if not best_proxy_prefix.startswith('http'):
+        best_proxy_prefix = f"https://{best_proxy_prefix}"
+    
+    # 每个代理的 URL、名称只计算一次，供所有目标文件复用
+    proxy_targets = proxy_link_targets(proxies[:4])
     
     module_prop: Path = path / "module.prop"
     # 处理每个目标文件
@@ -435,7 +573,7 @@ def proxy_handler(path: Path, target_files: list[Path], release_body: str, repo_
                         if '/releases/latest/download/' in original_url:
                             # 🔥 修复：使用当前版本代码匹配的文件名
                             # 从原始URL中提取基础文件名模式
-                            filename_match = re.search(r'/([^/]+)\.(zip|tar\.gz)$', original_url)
+                            filename_match = RELEASE_ASSET_NAME_RE.search(original_url)
                             if filename_match:
                                 # 生成新的文件名，使用当前的版本代码
                                 extension = filename_match.group(2)
@@ -447,16 +585,8 @@ def proxy_handler(path: Path, target_files: list[Path], release_body: str, repo_
                         else:
                             tag_url = original_url
                         
-                        # 2. 再添加代理前缀 - 🔥 修复URL拼接
-                        best_proxy_str = str(best_proxy)
-                        if not best_proxy_str.endswith('/'):
-                            best_proxy_str += '/'
-                        
-                        # 确保代理URL格式正确
-                        if best_proxy_str.startswith('http'):
-                            proxied_url = best_proxy_str + tag_url
-                        else:
-                            proxied_url = f"https://{best_proxy_str}" + tag_url
+                        # 2. 再添加代理前缀
+                        proxied_url = best_proxy_prefix + tag_url
                         
                         update_data['zipUrl'] = proxied_url
                         
@@ -470,7 +600,7 @@ def proxy_handler(path: Path, target_files: list[Path], release_body: str, repo_
                         info(f"  ✅ latest → {tag_name}")
                 
                 # 🔥 为 update.json 添加到 proxy_links 中
-                proxy_links.append(f"\n### 📥 {target_file.name} (更新配置文件)")
+                proxy_links.append(asset_heading(target_file.name))
                 proxy_links.append("\n**🔗 下载链接:**")
                 
                 # 生成 update.json 的官方链接
@@ -478,27 +608,8 @@ def proxy_handler(path: Path, target_files: list[Path], release_body: str, repo_
                 proxy_links.append(f"- [📦 官方下载]({update_json_url})")
                 
                 # 生成 update.json 的代理下载链接
-                for proxy in proxies[:2]:  # 为 update.json 显示前2个代理
-                    try:
-                        if isinstance(proxy, dict) and 'url' in proxy:
-                            proxy_url = str(proxy['url'])
-                            if not proxy_url.startswith('http'):
-                                proxy_url = f"https://{proxy_url}"
-                            
-                            full_proxy_url = f"{proxy_url}/{update_json_url}"
-                            proxy_name = str(proxy['url']).replace('https://', '').replace('http://', '')
-                            proxy_links.append(f"- [🚀 {proxy_name}]({full_proxy_url})")
-                        elif isinstance(proxy, str):
-                            proxy_url = proxy
-                            if not proxy_url.startswith('http'):
-                                proxy_url = f"https://{proxy_url}"
-                            
-                            full_proxy_url = f"{proxy_url}/{update_json_url}"
-                            proxy_name = proxy_url.replace('https://', '').replace('http://', '').replace('/', '')
-                            proxy_links.append(f"- [🚀 {proxy_name}]({full_proxy_url})")
-                    except Exception as e:
-                        warning(f"处理 {target_file.name} 代理失败: {e}")
-                        continue
+                for proxy_url, proxy_name, _ in proxy_targets[:2]:  # 为 update.json 显示前2个代理
+                    proxy_links.append(f"- [🚀 {proxy_name}]({proxy_url}/{update_json_url})")
                 
             except Exception as e:
                 warning(f"处理 {target_file.name} 失败: {e}")
@@ -507,7 +618,7 @@ def proxy_handler(path: Path, target_files: list[Path], release_body: str, repo_
             file_name = target_file.name
             
             # 添加文件下载部分到 release_body
-            proxy_links.append(f"\n### 📥 {file_name}")
+            proxy_links.append(asset_heading(file_name))
             proxy_links.append("\n**🔗 下载链接:**")
             
             # ⚠️ 重要：其他文件使用具体的 tag，不使用 latest！
@@ -515,69 +626,20 @@ def proxy_handler(path: Path, target_files: list[Path], release_body: str, repo_
             proxy_links.append(f"- [📦 官方下载]({original_url})")
             
             # 生成代理下载链接
-            for proxy in proxies[:4]:  # 显示前4个代理
-                try:
-                    # 从代理字典中提取URL
-                    if isinstance(proxy, dict) and 'url' in proxy:
-                        proxy_url = str(proxy['url'])
-                        if not proxy_url.startswith('http'):
-                            proxy_url = f"https://{proxy_url}"
-                        
-                        # 生成完整的代理链接
-                        full_proxy_url = f"{proxy_url}/{original_url}"
-                        
-                        # 提取代理名称用于显示
-                        proxy_name = str(proxy['url']).replace('https://', '').replace('http://', '')
-                        location = str(proxy.get('location', '')).strip()
-                        speed_val = proxy.get('speed', 0)
-                          # 安全转换 speed 值
-                        try:
-                            speed = float(str(speed_val)) if speed_val else 0
-                        except (ValueError, TypeError):
-                            speed = 0
-                        
-                        # 生成显示名称
-                        display_name = f"🚀 {proxy_name}"
-                        if location:
-                            display_name += f" ({location})"
-                        if speed > 0:
-                            display_name += f" - {speed:.1f}MB/s"
-                        
-                        proxy_links.append(f"- [{display_name}]({full_proxy_url})")
-                    elif isinstance(proxy, str):
-                        # 如果是字符串格式
-                        proxy_url = proxy
-                        if not proxy_url.startswith('http'):
-                            proxy_url = f"https://{proxy_url}"
-                        
-                        full_proxy_url = f"{proxy_url}/{original_url}"
-                        proxy_name = proxy_url.replace('https://', '').replace('http://', '').replace('/', '')
-                        proxy_links.append(f"- [🚀 {proxy_name}]({full_proxy_url})")
-                except Exception as e:
-                    warning(f"处理代理失败: {e}")
-                    continue
+            for proxy_url, _, display_name in proxy_targets:  # 显示前4个代理
+                proxy_links.append(f"- [{display_name}]({proxy_url}/{original_url})")
       # 处理 module.prop 文件中的 updateJson 链接
     if module_prop.exists():
         try:
             content = module_prop.read_text(encoding='utf-8')
             
             # 查找并替换 updateJson 链接
-            update_json_pattern = r'updateJson=(https://github\.com/[^\s]+)'
-            match = re.search(update_json_pattern, content)
+            match = UPDATE_JSON_URL_RE.search(content)
             
             if match:
                 original_update_url = match.group(1)
                 
-                # 🔥 修复：正确拼接代理URL
-                best_proxy_str = str(best_proxy)
-                if not best_proxy_str.endswith('/'):
-                    best_proxy_str += '/'
-                
-                # 确保代理URL格式正确
-                if best_proxy_str.startswith('http'):
-                    proxied_update_url = best_proxy_str + original_update_url
-                else:
-                    proxied_update_url = f"https://{best_proxy_str}" + original_update_url
+                proxied_update_url = best_proxy_prefix + original_update_url
                 
                 # 替换链接
                 new_content = content.replace(original_update_url, proxied_update_url)
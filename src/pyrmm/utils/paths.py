@@ -0,0 +1,4 @@
+from pathlib import Path
+
+# 默认的 RMM 根目录（可通过 RMM_ROOT 环境变量覆盖），只在模块加载时解析一次家目录
+DEFAULT_RMMROOT = Path.home() / "data" / "adb" / ".rmm"
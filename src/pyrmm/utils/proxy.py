@@ -1,9 +1,14 @@
 import json
 import os
-import requests
+import time
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, TYPE_CHECKING
+
+from .paths import DEFAULT_RMMROOT
+
+if TYPE_CHECKING:
+    import requests
 
 class ProxyManagerMeta(type):
     """
@@ -15,7 +20,7 @@ class ProxyManagerMeta(type):
         """
         Returns the root directory of the proxy manager.
         """
-        return Path(os.getenv("RMM_ROOT", Path.home() / "data" / "adb" / ".rmm"))
+        return Path(os.getenv("RMM_ROOT", DEFAULT_RMMROOT))
 
     @property
     def CACHE(cls):
@@ -44,23 +49,99 @@ class ProxyManager(metaclass=ProxyManagerMeta):
     API_URL = "https://api.akams.cn/github"
     CACHE_DURATION = timedelta(hours=10)  # 缓存10小时
     
+    # 进程内缓存：(缓存文件 mtime, 缓存数据)，文件未变化时免去重复解析
+    _memo: tuple[float, dict[str, Any]] | None = None
+    
+    # 复用的 HTTP 会话，首次请求时创建
+    _session: "requests.Session | None" = None
+    
+    @classmethod
+    def _get_session(cls) -> "requests.Session":
+        """
+        获取复用的 HTTP 会话（连接池 + 失败重试）
+        
+        Returns:
+            requests.Session: 共享的会话对象
+        """
+        if cls._session is None:
+            # 延迟导入：缓存命中时无需加载 requests/urllib3
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            retry = Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+            )
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+            cls._session = session
+        return cls._session
+    
     @classmethod
-    def _load_cache(cls) -> dict[str, Any] | None:
+    def _load_cache(cls, mtime: float | None = None) -> dict[str, Any] | None:
         """
         加载缓存数据
         
+        Args:
+            mtime: 调用方已获取的缓存文件修改时间，省略时重新 stat
+        
         Returns:
-            dict[str, object] | None: 缓存的代理数据，如果文件不存在或无效则返回None
+            dict[str, object] | None: 缓存的代理数据（副本，调用方可自由修改），如果文件不存在或无效则返回None
         """
+        if mtime is None:
+            mtime = cls._cache_mtime()
+            if mtime is None:
+                return None
+        if cls._memo is not None and cls._memo[0] == mtime:
+            return cls._copy_cache(cls._memo[1])
         try:
-            if cls.PROXY_CACHE_FILE.exists():
-                with open(cls.PROXY_CACHE_FILE, "r", encoding="utf-8") as f:
-                    cache_data = json.load(f)
-                    return cache_data
-        except (json.JSONDecodeError, FileNotFoundError, KeyError) as e:
+            with open(cls.PROXY_CACHE_FILE, "r", encoding="utf-8") as f:
+                cache_data = json.load(f)
+            if not cls._is_well_formed(cache_data):
+                print("⚠️  代理缓存格式无效，将重新获取")
+                return None
+            # 旧版缓存可能保存了字符串形式的数值，加载时统一转换一次
+            cls._normalize_proxies(cache_data["data"])
+            cls._memo = (mtime, cache_data)
+            return cls._copy_cache(cache_data)
+        except FileNotFoundError:
+            pass
+        except (json.JSONDecodeError, KeyError) as e:
             print(f"⚠️  加载代理缓存失败: {e}")
         return None
     
+    @staticmethod
+    def _is_well_formed(cache_data: Any) -> bool:
+        """
+        检查缓存内容的结构：顶层为字典，data 为由含 url 的字典组成的列表
+        
+        Args:
+            cache_data: 从缓存文件解析出的 JSON 数据
+            
+        Returns:
+            bool: 结构是否可用
+        """
+        if not isinstance(cache_data, dict):
+            return False
+        data = cache_data.get("data")
+        return isinstance(data, list) and all(isinstance(proxy, dict) and "url" in proxy for proxy in data)
+    
+    @staticmethod
+    def _copy_cache(cache_data: dict[str, Any]) -> dict[str, Any]:
+        """
+        复制缓存数据及其中的每个代理条目，调用方的修改不会影响进程内缓存
+        
+        Args:
+            cache_data: 进程内缓存的数据
+            
+        Returns:
+            dict[str, object]: 缓存数据副本
+        """
+        return {**cache_data, "data": [dict(proxy) for proxy in cache_data["data"]]}
+    
     @classmethod
     def _save_cache(cls, data: dict[str, Any]) -> None:
         """
@@ -69,75 +150,101 @@ class ProxyManager(metaclass=ProxyManagerMeta):
         Args:
             data: 要缓存的代理数据
         """
+        cache_file = cls.PROXY_CACHE_FILE
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
         try:
-            with open(cls.PROXY_CACHE_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            print(f"✅ 代理缓存已保存到: {cls.PROXY_CACHE_FILE}")
+            # 先写临时文件再原子替换，避免中断时留下损坏的缓存
+            # 一次序列化为字符串后整体写入，避免 json.dump 的大量小块写
+            # 缓存只供程序读取，使用紧凑格式（无缩进，可走 C 编码器）
+            tmp_file.write_text(json.dumps(data, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_file, cache_file)
+            cls._memo = (cache_file.stat().st_mtime, cls._copy_cache(data))
+            print(f"✅ 代理缓存已保存到: {cache_file}")
         except Exception as e:
+            tmp_file.unlink(missing_ok=True)
             print(f"❌ 保存代理缓存失败: {e}")
     
     @classmethod
-    def _is_cache_valid(cls, cache_data: dict[str, object]) -> bool:
+    def _cache_mtime(cls) -> float | None:
+        """
+        获取缓存文件的修改时间
+        
+        Returns:
+            float | None: 缓存文件的 mtime，文件不存在则返回None
+        """
+        try:
+            return cls.PROXY_CACHE_FILE.stat().st_mtime
+        except OSError:
+            return None
+    
+    @classmethod
+    def _is_cache_valid(cls, cache_data: dict[str, object], mtime: float) -> bool:
         """
         检查缓存是否仍然有效
         
+        以缓存文件的修改时间作为新鲜度依据，避免每次解析时间字符串
+        
         Args:
             cache_data: 缓存的数据
+            mtime: 缓存文件的修改时间
             
         Returns:
             bool: 缓存是否有效
         """
-        try:
-            # 检查必要字段
-            if not all(key in cache_data for key in ["cached_at", "data", "update_time"]):
-                return False
-            
-            # 检查本地缓存时间（10小时内）
-            cached_at = datetime.fromisoformat(cache_data["cached_at"])
-            if datetime.now() - cached_at > cls.CACHE_DURATION:
-                print("🕒 本地缓存已超过10小时，需要更新")
-                return False
-            
-            # 检查API更新时间（比较服务器更新时间）
-            api_update_time = cache_data.get("update_time", "")
-            if api_update_time:
-                try:
-                    # 解析API返回的更新时间
-                    api_time = datetime.strptime(api_update_time, "%Y-%m-%d %H:%M:%S")
-                    cached_time = datetime.strptime(cache_data.get("api_update_time", ""), "%Y-%m-%d %H:%M:%S")
-                    
-                    if api_time > cached_time:
-                        print(f"🔄 服务器数据已更新（{api_update_time}），需要刷新缓存")
-                        return False
-                except ValueError:
-                    # 时间解析失败，认为缓存无效
-                    return False
-            
-            print(f"✅ 缓存有效，最后更新时间: {cache_data.get('update_time', 'Unknown')}")
-            return True
-            
-        except Exception as e:
-            print(f"⚠️  检查缓存有效性时出错: {e}")
+        if "data" not in cache_data:
+            return False
+        
+        # 检查本地缓存时间（10小时内）
+        if time.time() - mtime > cls.CACHE_DURATION.total_seconds():
+            print("🕒 本地缓存已超过10小时，需要更新")
             return False
+        
+        print(f"✅ 缓存有效，最后更新时间: {cache_data.get('update_time', 'Unknown')}")
+        return True
     
     @classmethod
-    def _fetch_from_api(cls, timeout: int = 10) -> dict[str, object] | None:
+    def _fetch_from_api(cls, timeout: int = 10, cached: dict[str, Any] | None = None) -> dict[str, object] | None:
         """
         从API获取最新的代理列表
         
+        提供旧缓存时发送条件请求，服务器返回 304 则直接沿用缓存中的代理列表
+        
         Args:
             timeout: 请求超时时间（秒）
+            cached: 已过期的缓存数据，用于携带 ETag / Last-Modified
             
         Returns:
             dict[str, object] | None: API返回的数据，失败则返回None
         """
+        import requests
+        
+        headers = {}
+        if cached and "data" in cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
         try:
             print(f"🌐 正在从API获取GitHub代理列表: {cls.API_URL}")
             
-            response = requests.get(cls.API_URL, timeout=timeout)
+            response = cls._get_session().get(cls.API_URL, timeout=timeout, headers=headers)
+            
+            if response.status_code == 304 and headers:
+                print("✅ 代理列表未变化，沿用本地缓存")
+                return {
+                    "code": 200,
+                    "update_time": cached.get("api_update_time", ""),
+                    "total": cached.get("total", 0),
+                    "data": cached["data"],
+                    "etag": response.headers.get("ETag", cached.get("etag")),
+                    "last_modified": response.headers.get("Last-Modified", cached.get("last_modified")),
+                }
+            
             response.raise_for_status()
             
-            api_data = response.json()
+            # 直接解析原始字节：json 自动识别 UTF 编码，省去 requests 的字符集探测与解码
+            api_data = json.loads(response.content)
             
             # 验证API响应格式
             if api_data.get("code") != 200:
@@ -149,6 +256,8 @@ class ProxyManager(metaclass=ProxyManagerMeta):
                 return None
             
             print(f"✅ 成功获取 {api_data.get('total', 0)} 个代理")
+            api_data["etag"] = response.headers.get("ETag")
+            api_data["last_modified"] = response.headers.get("Last-Modified")
             return api_data
             
         except requests.exceptions.Timeout:
@@ -177,22 +286,27 @@ class ProxyManager(metaclass=ProxyManagerMeta):
         # 1. 尝试加载缓存
         cache_data = None
         if not force_update:
-            cache_data = cls._load_cache()
+            mtime = cls._cache_mtime()
+            if mtime is not None:
+                cache_data = cls._load_cache(mtime)
             
             # 2. 检查缓存有效性
-            if cache_data and cls._is_cache_valid(cache_data):
+            if cache_data and mtime is not None and cls._is_cache_valid(cache_data, mtime):
                 return cache_data["data"]
         
         # 3. 缓存无效或强制更新，从API获取
-        api_data = cls._fetch_from_api(timeout)
+        api_data = cls._fetch_from_api(timeout, cache_data)
         
         if api_data:
-            # 4. 保存新的缓存
+            # 4. 数值字段写入前统一转换，保存新的缓存
+            cls._normalize_proxies(api_data["data"])
             cache_entry = {
                 "cached_at": datetime.now().isoformat(),
                 "api_update_time": api_data.get("update_time", ""),
                 "update_time": api_data.get("update_time", ""),
                 "total": api_data.get("total", 0),
+                "etag": api_data.get("etag"),
+                "last_modified": api_data.get("last_modified"),
                 "data": api_data["data"]
             }
             cls._save_cache(cache_entry)
@@ -207,29 +321,67 @@ class ProxyManager(metaclass=ProxyManagerMeta):
         print("❌ 无法获取代理列表，返回空列表")
         return []
     
+    @staticmethod
+    def _normalize_proxies(proxies: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        将代理的延迟与速度统一转换为数值（原地修改）
+        
+        在保存或加载缓存时执行一次，评分时无需再逐项转换
+        
+        Args:
+            proxies: 代理列表
+            
+        Returns:
+            list[dict[str, object]]: 同一个代理列表
+        """
+        for proxy in proxies:
+            try:
+                proxy["latency"] = int(proxy.get("latency") or 9999)
+            except (TypeError, ValueError):
+                proxy["latency"] = 9999
+            try:
+                proxy["speed"] = float(proxy.get("speed") or 0)
+            except (TypeError, ValueError):
+                proxy["speed"] = 0.0
+        return proxies
+    
+    @staticmethod
+    def _score_proxy(proxy: dict[str, Any]) -> float:
+        """
+        代理评分：延迟越低越好，速度越高越好
+        
+        Args:
+            proxy: 已经过 _normalize_proxies 处理的代理信息
+            
+        Returns:
+            float: 评分，越高越好
+        """
+        # 简单评分算法：速度/延迟，延迟为0时设为1避免除零
+        return proxy["speed"] / max(proxy["latency"], 1)
+    
     @classmethod
-    def get_best_proxy(cls, force_update: bool = False) -> str | None:
+    def get_best_proxy(cls, force_update: bool = False, proxy_list: list[dict[str, Any]] | None = None) -> str | None:
         """
         获取最佳的GitHub代理URL（基于延迟和速度）
         
         Args:
             force_update: 是否强制更新代理列表
+            proxy_list: 调用方已获取的代理列表，提供时不再重新加载
             
         Returns:
             Optional[str]: 最佳代理URL，如果没有可用代理则返回None
         """
-        proxy_list = cls.get_proxy_list(force_update)
+        if proxy_list is None:
+            proxy_list = cls.get_proxy_list(force_update)
+        else:
+            # 调用方提供的列表可能是原始 API 数据，统一转换（对已处理的列表是幂等的）
+            cls._normalize_proxies(proxy_list)
         
         if not proxy_list:
             return None
-          # 根据延迟和速度排序（延迟越低越好，速度越高越好）
-        def score_proxy(proxy: dict[str, object]) -> float:
-            latency = int(proxy.get("latency", 9999) or 9999)
-            speed = float(proxy.get("speed", 0) or 0)
-            # 简单评分算法：速度/延迟，延迟为0时设为1避免除零
-            return speed / max(latency, 1)
-        
-        best_proxy = max(proxy_list, key=score_proxy)
+        
+        # 单次线性扫描取最高分，无需排序
+        best_proxy = max(proxy_list, key=cls._score_proxy)
         print(f"🚀 选择最佳代理: {best_proxy['url']} (延迟: {best_proxy.get('latency', 'N/A')}ms, 速度: {best_proxy.get('speed', 'N/A')}MB/s)")
         
         return best_proxy["url"]
@@ -239,6 +391,7 @@ class ProxyManager(metaclass=ProxyManagerMeta):
         """
         清除代理缓存
         """
+        cls._memo = None
         try:
             if cls.PROXY_CACHE_FILE.exists():
                 cls.PROXY_CACHE_FILE.unlink()
@@ -293,17 +446,18 @@ def get_github_proxies(force_update: bool = False) -> list[dict[str, object]]:
     return ProxyManager.get_proxy_list(force_update)
 
 
-def get_best_github_proxy(force_update: bool = False) -> str | None:
+def get_best_github_proxy(force_update: bool = False, proxy_list: list[dict[str, Any]] | None = None) -> str | None:
     """
     获取最佳GitHub代理的便捷函数
     
     Args:
         force_update: 是否强制更新
+        proxy_list: 已获取的代理列表，提供时直接从中选择
         
     Returns:
         Optional[str]: 最佳代理URL
     """
-    return ProxyManager.get_best_proxy(force_update)
+    return ProxyManager.get_best_proxy(force_update, proxy_list)
 
 
 # 示例用法和测试